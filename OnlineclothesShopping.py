@@ -4,7 +4,20 @@
 # view the cart, and see the total cost.
 # ----------------------------------------------------------------------
 
+import bisect
+import heapq
+import json
+import os
+import sqlite3
+import sys
+import threading
 import time
+import urllib.parse
+from collections import OrderedDict
+from decimal import ROUND_HALF_UP, Decimal
+from itertools import islice
+
+from output_sinks import emit
 
 # --- 1. Product Class ---
 
@@ -12,93 +25,848 @@ class Product:
     """
     A blueprint for a single clothing item.
     It holds essential details like name, price, and stock count.
+
+    __slots__ keeps each product small (no per-object __dict__), which adds
+    up for big catalogs. When a product belongs to a Catalog, changing its
+    stock or price keeps the catalog's indexes up to date automatically.
     """
+    __slots__ = ("id", "name", "category", "_price", "_stock", "_catalog")
+
     def __init__(self, item_id, name, category, price, stock):
+        self._catalog = None
         self.id = item_id
         self.name = name
         self.category = category
-        self.price = price
-        self.stock = stock
+        self._price = price
+        self._stock = stock
+
+    @property
+    def price(self):
+        return self._price
+
+    @price.setter
+    def price(self, new_price):
+        old_price, self._price = self._price, new_price
+        if self._catalog is not None:
+            self._catalog._price_changed(self, old_price)
+
+    @property
+    def stock(self):
+        return self._stock
+
+    @stock.setter
+    def stock(self, new_stock):
+        old_stock, self._stock = self._stock, new_stock
+        if self._catalog is not None:
+            self._catalog._stock_changed(self, old_stock)
 
     def __str__(self):
         """Returns a human-readable string representation of the product."""
         return f"{self.id}. {self.name} ({self.category}) - ${self.price:.2f} (In Stock: {self.stock})"
 
-# --- 2. ShoppingCart Class ---
+# --- 2. Catalog Class ---
+
+class _SortedIndex:
+    """
+    A sorted list kept as a row of short sorted chunks, so adding or
+    removing one value only shifts the items of one chunk (a few hundred)
+    instead of everything after it. Built from many values at once, it sorts
+    them a single time.
+    """
+    CHUNK = 512
+
+    def __init__(self, values=()):
+        ordered = sorted(values)
+        self._chunks = [ordered[start:start + self.CHUNK] for start in range(0, len(ordered), self.CHUNK)]
+        self._maxes = [chunk[-1] for chunk in self._chunks]  # the last value of every chunk
+        self._len = len(ordered)
+
+    def __len__(self):
+        return self._len
+
+    def add(self, value):
+        if not self._chunks:
+            self._chunks.append([value])
+            self._maxes.append(value)
+        else:
+            index = min(bisect.bisect_left(self._maxes, value), len(self._chunks) - 1)
+            chunk = self._chunks[index]
+            bisect.insort(chunk, value)
+            self._maxes[index] = chunk[-1]
+            if len(chunk) > 2 * self.CHUNK:
+                # Split an overgrown chunk in two
+                self._chunks.insert(index + 1, chunk[self.CHUNK:])
+                del chunk[self.CHUNK:]
+                self._maxes.insert(index, chunk[-1])
+        self._len += 1
+
+    def remove(self, value):
+        index = bisect.bisect_left(self._maxes, value)
+        chunk = self._chunks[index]
+        del chunk[bisect.bisect_left(chunk, value)]
+        if chunk:
+            self._maxes[index] = chunk[-1]
+        else:
+            del self._chunks[index], self._maxes[index]
+        self._len -= 1
+
+    def page(self, offset=0, limit=None):
+        """The values from position `offset` on, at most `limit` of them."""
+        found = []
+        for chunk in self._chunks:
+            if offset >= len(chunk):
+                offset -= len(chunk)
+                continue
+            found.extend(chunk[offset:])
+            offset = 0
+            if limit is not None and len(found) >= limit:
+                return found[:limit]
+        return found
+
+    def between(self, low, high):
+        """The values from `low` to `high` (both included), in order."""
+        index = bisect.bisect_left(self._maxes, low)
+        for chunk in self._chunks[index:]:
+            start = bisect.bisect_left(chunk, low)
+            stop = bisect.bisect_right(chunk, high)
+            yield from chunk[start:stop]
+            if stop < len(chunk):
+                return
+
+
+class Catalog:
+    """
+    The store's inventory, with indexes so browsing never has to look at
+    every product:
+      - products by category, and the in-stock ones of every category
+      - a price-sorted index for price range searches
+      - the set of products that are currently in stock
+    The indexes follow every stock and price change made to its products,
+    under a lock, since shoppers in many threads change stock at once.
+    It can be used like the old {id: Product} dictionary.
+    """
+    def __init__(self, products=()):
+        self._lock = threading.Lock()
+        self._products = {}      # id -> Product
+        self._in_stock = set()   # ids of products with stock > 0
+        members_of = {}          # category -> [ids], only while building
+        for product in products:
+            if product.id in self._products:
+                raise ValueError(f"Product ID {product.id} is already in the catalog.")
+            self._products[product.id] = product
+            members_of.setdefault(product.category, []).append(product.id)
+            if product.stock > 0:
+                self._in_stock.add(product.id)
+            product._catalog = self
+
+        # Every sorted index is sorted once here, not grown one insert at a time
+        self._by_price = _SortedIndex((product.price, product.id) for product in self._products.values())
+        self._in_stock_ids = _SortedIndex(self._in_stock)
+        self._by_category = {category: _SortedIndex(members) for category, members in members_of.items()}
+        self._in_stock_by_category = {
+            category: _SortedIndex(item_id for item_id in members if item_id in self._in_stock)
+            for category, members in members_of.items()}
+
+    def add(self, product):
+        """Adds a product to the catalog and its indexes."""
+        with self._lock:
+            if product.id in self._products:
+                raise ValueError(f"Product ID {product.id} is already in the catalog.")
+            self._products[product.id] = product
+            self._by_category.setdefault(product.category, _SortedIndex()).add(product.id)
+            self._in_stock_by_category.setdefault(product.category, _SortedIndex())
+            self._by_price.add((product.price, product.id))
+            if product.stock > 0:
+                self._mark_in_stock(product)
+            product._catalog = self
+
+    # Dictionary-style access, so existing code keeps working
+    def __getitem__(self, item_id):
+        return self._products[item_id]
+
+    def __contains__(self, item_id):
+        return item_id in self._products
+
+    def __len__(self):
+        return len(self._products)
+
+    def values(self):
+        return self._products.values()
+
+    def in_stock(self, offset=0, limit=None):
+        """Products with stock left, by ID (one page of them with offset/limit)."""
+        with self._lock:
+            return [self._products[item_id] for item_id in self._in_stock_ids.page(offset, limit)]
+
+    def categories(self):
+        return sorted(self._by_category)
+
+    def by_category(self, category, in_stock_only=True, offset=0, limit=None):
+        """Products in one category, by ID."""
+        with self._lock:
+            index = (self._in_stock_by_category if in_stock_only else self._by_category).get(category)
+            return [self._products[item_id] for item_id in index.page(offset, limit)] if index else []
+
+    def price_between(self, low, high, in_stock_only=True, offset=0, limit=None):
+        """Products priced from `low` to `high` (both included), cheapest first."""
+        with self._lock:
+            found = (item_id for _, item_id in self._by_price.between((low, float("-inf")), (high, float("inf")))
+                     if not in_stock_only or item_id in self._in_stock)
+            # Only the wanted page is walked, not every product in the range
+            page = islice(found, offset, None if limit is None else offset + limit)
+            return [self._products[item_id] for item_id in page]
+
+    def _mark_in_stock(self, product):
+        self._in_stock.add(product.id)
+        self._in_stock_ids.add(product.id)
+        self._in_stock_by_category[product.category].add(product.id)
+
+    def _stock_changed(self, product, old_stock):
+        # Most stock changes leave a product in stock (or sold out), and
+        # then no index changes: only take the lock when it crosses zero,
+        # so add-to-cart doesn't funnel every shopper through one lock
+        if (old_stock > 0) == (product.stock > 0):
+            return
+        with self._lock:
+            if product.stock > 0 and product.id not in self._in_stock:
+                self._mark_in_stock(product)
+            elif product.stock <= 0 and product.id in self._in_stock:
+                self._in_stock.discard(product.id)
+                self._in_stock_ids.remove(product.id)
+                self._in_stock_by_category[product.category].remove(product.id)
+
+    def _price_changed(self, product, old_price):
+        with self._lock:
+            self._by_price.remove((old_price, product.id))
+            self._by_price.add((product.price, product.id))
+
+# --- 3. Catalog Loading from Disk ---
+
+class SQLiteCatalogSource:
+    """
+    Reads products from a SQLite file with a `products` table
+    (id, name, category, price, stock). Nothing is loaded up front: every
+    question is answered with a small indexed query when it is asked.
+
+    The file is opened read-only and never changed. It must already have
+    indexes on category and on price (see SCHEMA), or browsing would scan
+    the whole table; opening a catalog without them raises ValueError.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS products (
+            id INTEGER PRIMARY KEY, name TEXT NOT NULL, category TEXT NOT NULL,
+            price REAL NOT NULL, stock INTEGER NOT NULL);
+        CREATE INDEX IF NOT EXISTS products_by_category ON products (category, id);
+        CREATE INDEX IF NOT EXISTS products_by_price ON products (price, id);
+        CREATE INDEX IF NOT EXISTS products_in_stock ON products (id) WHERE stock > 0;
+    """
+    COLUMNS = "id, name, category, price, stock"
+    INDEXED_COLUMNS = ("category", "price")  # Each must lead some index
+
+    def __init__(self, path):
+        self.path = path
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No catalog at '{path}'")
+        self.connection = sqlite3.connect(f"file:{urllib.parse.quote(os.path.abspath(path))}?mode=ro",
+                                          uri=True, check_same_thread=False)
+        self._check_indexes()
+        self._create_sold_out_table()
+
+    def _check_indexes(self):
+        # The first column of every index on the products table
+        leading = {row[0] for row in self.connection.execute(
+            "SELECT info.name FROM pragma_index_list('products') AS list, pragma_index_info(list.name) AS info "
+            "WHERE info.seqno = 0")}
+        missing = [column for column in self.INDEXED_COLUMNS if column not in leading]
+        if missing:
+            raise ValueError(f"The catalog '{self.path}' needs an index on {' and '.join(missing)}, e.g.:"
+                             + "".join(f"\n  CREATE INDEX products_by_{column} ON products ({column}, id);"
+                                       for column in missing))
+
+    def _create_sold_out_table(self):
+        # Products that sold out during this session. It's a TEMP table, so
+        # it lives beside the connection and never touches the catalog file.
+        self.connection.execute("CREATE TEMP TABLE sold_out (id INTEGER PRIMARY KEY)")
+
+    def update_sold_out(self, sold_out, restocked):
+        """Records which products sold out (or came back) since the catalog was opened."""
+        with self.connection:
+            self.connection.executemany("INSERT OR IGNORE INTO temp.sold_out VALUES (?)",
+                                        ((item_id,) for item_id in sold_out))
+            self.connection.executemany("DELETE FROM temp.sold_out WHERE id = ?",
+                                        ((item_id,) for item_id in restocked))
+
+    def fetch(self, item_id):
+        return self.connection.execute(
+            f"SELECT {self.COLUMNS} FROM products WHERE id = ?", (item_id,)).fetchone()
+
+    def count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+    def categories(self):
+        return [row[0] for row in self.connection.execute(
+            "SELECT DISTINCT category FROM products ORDER BY category")]
+
+    def page(self, where="1", arguments=(), order="id", offset=0, limit=None):
+        # One page of product rows matching a WHERE clause
+        return self.connection.execute(
+            f"SELECT {self.COLUMNS} FROM products WHERE {where} ORDER BY {order} "
+            f"LIMIT ? OFFSET ?", (*arguments, -1 if limit is None else limit, offset))
+
+    def close(self):
+        self.connection.close()
+
+
+class JsonLinesCatalogSource(SQLiteCatalogSource):
+    """
+    Reads products from a JSON-lines file, one product per line:
+        {"id": 1, "name": "...", "category": "...", "price": 49.99, "stock": 15}
+
+    The first time a file is opened (a "cold start") it is copied once into
+    a SQLite cache beside it; after that (a "warm start") the cache is used
+    directly, until the JSON-lines file changes.
+    """
+    BATCH = 10000  # Rows inserted per transaction while building the cache
+
+    def __init__(self, path):
+        # The cache is our own file, so unlike a catalog it may be written to
+        self.source_path = path
+        self.path = path + ".sqlite"
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.executescript(self.SCHEMA)
+        self._refresh_cache()
+        self._create_sold_out_table()
+
+    def _refresh_cache(self):
+        info = os.stat(self.source_path)
+        stamp = f"{info.st_mtime_ns}:{info.st_size}"
+        self.connection.execute("CREATE TABLE IF NOT EXISTS source (stamp TEXT)")
+        row = self.connection.execute("SELECT stamp FROM source").fetchone()
+        if row is not None and row[0] == stamp:
+            return
+
+        with self.connection:
+            self.connection.execute("DELETE FROM products")
+            self.connection.execute("DELETE FROM source")
+            with open(self.source_path, "r") as file:
+                batch = []
+                for line in file:
+                    if line.strip():
+                        item = json.loads(line)
+                        batch.append((item["id"], item["name"], item["category"],
+                                      item["price"], item["stock"]))
+                    if len(batch) >= self.BATCH:
+                        self.connection.executemany("INSERT INTO products VALUES (?, ?, ?, ?, ?)", batch)
+                        batch = []
+                self.connection.executemany("INSERT INTO products VALUES (?, ?, ?, ?, ?)", batch)
+            self.connection.execute("INSERT INTO source VALUES (?)", (stamp,))
+
+
+def open_catalog_source(path):
+    """Picks the right source for a .sqlite/.db or a .jsonl/.json file."""
+    if path.lower().endswith((".jsonl", ".json", ".ndjson")):
+        return JsonLinesCatalogSource(path)
+    return SQLiteCatalogSource(path)
+
+
+class LazyCatalog:
+    """
+    A Catalog that loads products from a source only when they're needed.
+
+    Recently used products are kept in a bounded LRU cache, so memory stays
+    small however big the catalog is. Products whose stock or price changed
+    during this session are kept in memory for good, so those changes are
+    never lost when the cache lets a product go. It answers the same
+    questions as Catalog, page by page.
+    """
+    def __init__(self, source, cache_size=1024):
+        self.source = source
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # id -> Product, least recently used first
+        self._changed = {}           # id -> Product changed in this session
+        self._stock_changes = set()  # ids whose stock changed since the source last heard
+        self._lock = threading.Lock()
+
+    def _product(self, row):
+        item_id = row[0]
+        product = self._changed.get(item_id) or self._cache.get(item_id)
+        if product is None:
+            product = Product(*row)
+            product._catalog = self
+            self._cache[item_id] = product
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        elif item_id in self._cache:
+            self._cache.move_to_end(item_id)
+        return product
+
+    def __getitem__(self, item_id):
+        product = self._changed.get(item_id) or self._cache.get(item_id)
+        if product is not None:
+            if item_id in self._cache:
+                self._cache.move_to_end(item_id)
+            return product
+        row = self.source.fetch(item_id)
+        if row is None:
+            raise KeyError(item_id)
+        return self._product(row)
+
+    def __contains__(self, item_id):
+        try:
+            self[item_id]
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self):
+        return self.source.count()
+
+    def values(self, page_size=1000):
+        """Every product, one page at a time."""
+        offset = 0
+        while True:
+            rows = self.source.page(offset=offset, limit=page_size).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._product(row)
+            offset += len(rows)
+
+    def categories(self):
+        return self.source.categories()
+
+    def _query(self, where, arguments, order, in_stock_only, offset, limit):
+        if in_stock_only:
+            # The source only knows the stock it started with, so leave out
+            # the products that sold out during this session. Only the
+            # stock changes since the last query are passed on to it.
+            with self._lock:
+                changed, self._stock_changes = self._stock_changes, set()
+                if changed:
+                    sold_out = [item_id for item_id in changed if self._changed[item_id].stock <= 0]
+                    self.source.update_sold_out(sold_out, changed.difference(sold_out))
+            where += " AND stock > 0 AND id NOT IN (SELECT id FROM temp.sold_out)"
+        return [self._product(row) for row in
+                self.source.page(where, arguments, order, offset, limit)]
+
+    def in_stock(self, offset=0, limit=None):
+        return self._query("1", (), "id", True, offset, limit)
+
+    def by_category(self, category, in_stock_only=True, offset=0, limit=None):
+        return self._query("category = ?", (category,), "id", in_stock_only, offset, limit)
+
+    def price_between(self, low, high, in_stock_only=True, offset=0, limit=None):
+        return self._query("price BETWEEN ? AND ?", (low, high), "price, id",
+                           in_stock_only, offset, limit)
+
+    def _stock_changed(self, product, old_stock):
+        self._changed[product.id] = product
+        if (old_stock > 0) != (product.stock > 0):  # Sold out, or back in stock
+            with self._lock:
+                self._stock_changes.add(product.id)
+
+    def _price_changed(self, product, old_price):
+        self._changed[product.id] = product
+
+
+def benchmark_startup(products=200000):
+    """Time from launch to the first page of products, cold and warm."""
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "catalog.jsonl")
+        categories = ["Tops", "Bottoms", "Outerwear", "Accessories", "Shoes"]
+        with open(path, "w") as file:
+            for item_id in range(1, products + 1):
+                file.write(json.dumps({"id": item_id, "name": f"Item {item_id}",
+                                       "category": categories[item_id % len(categories)],
+                                       "price": round(5 + (item_id * 7.31) % 200, 2),
+                                       "stock": item_id % 17}) + "\n")
+
+        print(f"📏 Startup with a {products:,}-product JSON-lines catalog")
+        for label in ("cold start", "warm start"):
+            start = time.perf_counter()
+            catalog = LazyCatalog(open_catalog_source(path))
+            first_page = catalog.in_stock(limit=ShoppingApp.PAGE_SIZE)
+            elapsed = time.perf_counter() - start
+            catalog.source.close()
+            print(f"  {label:<11} {elapsed * 1000:9.1f} ms  ({len(first_page)} products on the first page)")
+
+# --- 4. Stock Reservations ---
+
+class _Stripe:
+    """One lock plus the reservations of the products that hash to it."""
+    __slots__ = ("lock", "held", "deadlines")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.held = {}        # (cart id, product id) -> [cart, product, quantity, deadline]
+        self.deadlines = []   # heap of (deadline, (cart id, product id))
+
+
+class StockReservations:
+    """
+    Hands stock out to carts safely when many shoppers buy at the same time.
+
+    Products are spread over a fixed set of "stripes", each with its own
+    lock. Two shoppers grabbing the same product are served one at a time,
+    and the stock check and the decrement happen together, so stock can
+    never be oversold. Shoppers buying different products almost never wait
+    for each other.
+
+    With a `timeout` (in seconds), stock that isn't checked out in time goes
+    back on the shelf, e.g. when a cart is abandoned. Call expire() now and
+    then, or start_reaper() to have a background thread do it.
+    """
+    def __init__(self, timeout=None, stripes=64, clock=time.monotonic):
+        self.timeout = timeout
+        self.clock = clock
+        self._stripes = [_Stripe() for _ in range(stripes)]
+        self._reaper = None
+        self._stop_reaper = threading.Event()
+
+    def _stripe(self, product):
+        return self._stripes[hash(product.id) % len(self._stripes)]
+
+    def reserve(self, cart, product, quantity):
+        """Takes `quantity` off the shelf for `cart`; False if there isn't enough."""
+        stripe = self._stripe(product)
+        key = (id(cart), product.id)
+        with stripe.lock:
+            if product.stock < quantity:
+                return False
+            product.stock -= quantity
+
+            record = stripe.held.get(key)
+            if record is None:
+                record = stripe.held[key] = [cart, product, 0, None]
+            record[2] += quantity
+            if self.timeout is not None:
+                # Every new reservation restarts the clock for this product
+                record[3] = self.clock() + self.timeout
+                heapq.heappush(stripe.deadlines, (record[3], key))
+            cart._reserved(product, quantity)
+        return True
+
+    def release(self, cart, product):
+        """Puts everything `cart` holds of `product` back on the shelf."""
+        stripe = self._stripe(product)
+        with stripe.lock:
+            record = stripe.held.pop((id(cart), product.id), None)
+            if record is not None:
+                product.stock += record[2]
+                cart._released(product, record[2])
+
+    def commit(self, cart):
+        """The cart checked out: its reservations become sales for good."""
+        for product in cart.lines_snapshot():
+            stripe = self._stripe(product)
+            with stripe.lock:
+                stripe.held.pop((id(cart), product.id), None)
+
+    def commit_many(self, carts):
+        """
+        Checks out many carts in one pass. Every stripe lock is taken once
+        for the whole batch (in order, so two batches can't deadlock)
+        instead of once per cart line.
+        """
+        stripes, count = self._stripes, len(self._stripes)
+        for stripe in stripes:
+            stripe.lock.acquire()
+        try:
+            for cart in carts:
+                cart_id = id(cart)
+                for product in cart.lines_snapshot():
+                    stripes[hash(product.id) % count].held.pop((cart_id, product.id), None)
+        finally:
+            for stripe in stripes:
+                stripe.lock.release()
+
+    def expire(self):
+        """Returns the stock of every reservation that ran out of time."""
+        now = self.clock()
+        expired = 0
+        for stripe in self._stripes:
+            with stripe.lock:
+                while stripe.deadlines and stripe.deadlines[0][0] <= now:
+                    deadline, key = heapq.heappop(stripe.deadlines)
+                    record = stripe.held.get(key)
+                    # Skip entries for reservations that were renewed or are gone
+                    if record is None or record[3] != deadline:
+                        continue
+                    cart, product, quantity, _ = stripe.held.pop(key)
+                    product.stock += quantity
+                    cart._released(product, quantity)
+                    expired += 1
+        return expired
+
+    def start_reaper(self, interval=1.0):
+        """Starts a background thread that calls expire() every `interval` seconds."""
+        if self._reaper is not None:
+            return
+        self._stop_reaper.clear()
+
+        def reap():
+            while not self._stop_reaper.wait(interval):
+                self.expire()
+
+        self._reaper = threading.Thread(target=reap, name="stock-reaper", daemon=True)
+        self._reaper.start()
+
+    def stop_reaper(self):
+        if self._reaper is not None:
+            self._stop_reaper.set()
+            self._reaper.join()
+            self._reaper = None
+
+
+# Carts share this one unless they're given their own. It has no timeout,
+# so stock stays in a cart until checkout, just like before.
+DEFAULT_RESERVATIONS = StockReservations()
+
+
+def load_test_reservations(thread_counts=(1, 2, 4, 8), products=256, stock=500,
+                           attempts_per_thread=20000):
+    """
+    Many shoppers add to their carts at once. Checks that no product is
+    ever oversold and that the catalog's in-stock index still matches the
+    stock, and reports add-to-cart operations per second.
+    """
+    import random
+
+    print(f"📏 Add-to-cart load test: {products} products, {attempts_per_thread:,} tries per shopper")
+    for threads in thread_counts:
+        shelf = [Product(item_id, f"Item {item_id}", "Tops", 9.99, stock) for item_id in range(products)]
+        catalog = Catalog(shelf)  # So every stock change also updates its indexes
+        reservations = StockReservations()
+        carts = [ShoppingCart(reservations) for _ in range(threads)]
+        start_line = threading.Barrier(threads + 1)
+
+        def shop(cart, seed):
+            chooser = random.Random(seed)
+            start_line.wait()
+            for _ in range(attempts_per_thread):
+                reservations.reserve(cart, chooser.choice(shelf), chooser.randint(1, 3))
+
+        workers = [threading.Thread(target=shop, args=(cart, number)) for number, cart in enumerate(carts)]
+        for worker in workers:
+            worker.start()
+        start_line.wait()
+        start = time.perf_counter()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+
+        oversold = sum(1 for product in shelf
+                       if product.stock < 0
+                       or product.stock + sum(cart.items.get(product, 0) for cart in carts) != stock)
+        in_stock = [product.id for product in shelf if product.stock > 0]
+        index_ok = [product.id for product in catalog.in_stock()] == in_stock
+        operations = threads * attempts_per_thread
+        print(f"  {threads:>2} shopper(s): {operations / elapsed:12,.0f} adds/sec, "
+              f"{oversold} product(s) oversold, in-stock index {'✅' if index_ok else '❌ out of date'}")
+
+# --- 5. ShoppingCart Class ---
+
+def to_cents(price):
+    """A price in dollars as a whole number of cents, so totals add up exactly."""
+    return int((Decimal(str(price)) * 100).to_integral_value(ROUND_HALF_UP))
+
+
+def format_cents(cents):
+    return f"${Decimal(cents).scaleb(-2):.2f}"
+
 
 class ShoppingCart:
     """
     Manages the user's cart. It keeps track of the items added and their quantities.
+    Stock is taken through a StockReservations engine, so many carts can
+    shop at the same time without overselling.
+
+    The grand total is kept in whole cents and updated on every add or
+    remove, so asking for it never has to walk the cart. A product's price
+    is locked in when it first goes into the cart.
     """
-    def __init__(self):
+    def __init__(self, reservations=None):
         # The cart is a dictionary mapping Product objects to quantities (integers)
         self.items = {}
+        self.reservations = reservations if reservations is not None else DEFAULT_RESERVATIONS
+        self.total_cents = 0
+        self._unit_cents = {}  # Product -> price in cents when it was added
+        self._lock = threading.Lock()
 
     def add_item(self, product, quantity):
-        """Adds a product to the cart or updates its quantity."""
-        if product.stock < quantity:
-            print(f"\n🚫 Sorry, only {product.stock} of '{product.name}' are available.")
-            return
+        """
+        Adds a product to the cart or updates its quantity. Reports through
+        the current output sink and returns the Event (truthy if it worked).
+        """
+        # Checking the stock and taking it off the shelf happen in one step
+        if not self.reservations.reserve(self, product, quantity):
+            return emit("add_item", False, "\n🚫 Sorry, only {stock} of '{name}' are available.",
+                        id=product.id, name=product.name, quantity=quantity, stock=product.stock)
 
-        # If the product is already in the cart, increase the quantity
-        if product in self.items:
-            self.items[product] += quantity
-        else:
-            # Otherwise, add it to the cart
-            self.items[product] = quantity
+        return emit("add_item", True, "\n🛒 Added {quantity} x '{name}' to your cart!",
+                    id=product.id, name=product.name, quantity=quantity)
+
+    def remove_item(self, product):
+        """Takes a product out of the cart and puts it back on the shelf."""
+        self.reservations.release(self, product)
+
+    def checkout(self):
+        """Turns everything in the cart into a sale, so it can't expire anymore."""
+        self.reservations.commit(self)
+
+    def _reserved(self, product, quantity):
+        # Called by the reservations engine once the stock is ours
+        with self._lock:
+            unit_cents = self._unit_cents.get(product)
+            if unit_cents is None:
+                unit_cents = self._unit_cents[product] = to_cents(product.price)
+            self.items[product] = self.items.get(product, 0) + quantity
+            self.total_cents += unit_cents * quantity
+
+    def _released(self, product, quantity):
+        # Called by the reservations engine when stock goes back on the shelf
+        with self._lock:
+            held = self.items.get(product, 0)
+            quantity = min(quantity, held)
+            self.total_cents -= self._unit_cents.get(product, 0) * quantity
+            if held > quantity:
+                self.items[product] = held - quantity
+            else:
+                self.items.pop(product, None)
+                self._unit_cents.pop(product, None)
+
+    def lines_snapshot(self):
+        """The products in the cart right now (other threads may be changing it)."""
+        with self._lock:
+            return list(self.items)
+
+    def lines(self):
+        """A snapshot of (product, quantity, price in cents) for every cart line."""
+        with self._lock:
+            return [(product, quantity, self._unit_cents[product])
+                    for product, quantity in self.items.items()]
 
-        product.stock -= quantity
-        print(f"\n🛒 Added {quantity} x '{product.name}' to your cart!")
+    @property
+    def total(self):
+        """The grand total in dollars, as an exact Decimal."""
+        return Decimal(self.total_cents).scaleb(-2)
+
+    def calculate_total(self):
+        """Returns the grand total of the cart. Nothing is printed."""
+        return self.total
+
+    def render(self):
+        """The cart as text: every line with its subtotal, then the grand total."""
+        lines = self.lines()
+        if not lines:
+            return "\nYour shopping cart is currently empty. Time to find some new clothes!"
+
+        text = ["\n--- Your Shopping Cart ---"]
+        for product, quantity, unit_cents in lines:
+            text.append(f"- {product.name.ljust(25)} x {str(quantity).ljust(2)} "
+                        f"@ {format_cents(unit_cents)} = {format_cents(unit_cents * quantity)}")
+        text.append("-" * 30)
+        text.append(f"Grand Total: {format_cents(sum(unit * quantity for _, quantity, unit in lines))}")
+        text.append("-" * 30)
+        return "\n".join(text)
 
     def view_details(self):
-        """Displays all items currently in the cart with their subtotals."""
-        if not self.items:
-            print("\nYour shopping cart is currently empty. Time to find some new clothes!")
-            return 0.0
+        """Displays all items currently in the cart with their subtotals and the total."""
+        print(self.render())
+        return self.total
 
-        print("\n--- Your Shopping Cart ---")
-        total_cost = 0.0
 
-        # Loop through each product and its quantity in the cart
-        for product, quantity in self.items.items():
+def checkout_carts(carts):
+    """
+    Checks out many carts at once. Carts that share a StockReservations
+    engine are committed together in one pass. Returns the combined total
+    in cents.
+    """
+    by_engine = {}
+    for cart in carts:
+        by_engine.setdefault(id(cart.reservations), (cart.reservations, []))[1].append(cart)
+    for reservations, group in by_engine.values():
+        reservations.commit_many(group)
+    return sum(cart.total_cents for cart in carts)
+
+
+def benchmark_cart(lines=5000, carts=200, lines_per_cart=1000, views=1000):
+    """
+    Cart totals: walking every line vs the running total, and checkout one
+    cart at a time vs all carts in one batch.
+    """
+    import io
+
+    shelf = [Product(item_id, f"Item {item_id}", "Tops", 9.99 + item_id % 7, 10 ** 6)
+             for item_id in range(lines)]
+    cart = ShoppingCart(StockReservations())
+    for product in shelf:
+        cart.reservations.reserve(cart, product, 2)
+
+    def walk_total():
+        # The old way: every line is printed just to add up the total
+        out = io.StringIO()
+        total_cost = 0.0
+        for product, quantity in cart.items.items():
             subtotal = product.price * quantity
             total_cost += subtotal
-            print(f"- {product.name.ljust(25)} x {str(quantity).ljust(2)} @ ${product.price:.2f} = ${subtotal:.2f}")
-
+            print(f"- {product.name.ljust(25)} x {str(quantity).ljust(2)} @ ${product.price:.2f} = ${subtotal:.2f}",
+                  file=out)
         return total_cost
 
-    def calculate_total(self):
-        """Calculates and returns the grand total of the cart."""
-        total = self.view_details()
-        print("-" * 30)
-        print(f"Grand Total: ${total:.2f}")
-        print("-" * 30)
-        return total
+    print(f"📏 Cart total with {lines:,} lines, asked for {views:,} times")
+    for label, total_of in (("walk + print", walk_total), ("running total", cart.calculate_total)):
+        start = time.perf_counter()
+        for _ in range(views):
+            total = total_of()
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<14} {elapsed / views * 1e6:12,.1f} µs per total  (${total:,.2f})")
+
+    print(f"📏 Checkout of {carts} carts x {lines_per_cart:,} lines")
+    for label in ("one at a time", "batched"):
+        reservations = StockReservations()
+        basket = [ShoppingCart(reservations) for _ in range(carts)]
+        for number, shopper in enumerate(basket):
+            for offset in range(lines_per_cart):
+                reservations.reserve(shopper, shelf[(number + offset) % lines], 1)
+        start = time.perf_counter()
+        if label == "batched":
+            grand_total = checkout_carts(basket)
+        else:
+            for shopper in basket:
+                shopper.checkout()
+            grand_total = sum(shopper.total_cents for shopper in basket)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<14} {elapsed * 1000:9.1f} ms  ({format_cents(grand_total)} sold)")
 
-# --- 3. Main Application Class ---
+# --- 6. Main Application Class ---
 
 class ShoppingApp:
     """
     The main engine for the shopping experience, handling data and user interaction.
     """
-    def __init__(self):
-        self.products = self._load_products()
+    PAGE_SIZE = 20  # Products shown at a time while browsing
+
+    def __init__(self, catalog=None):
+        """`catalog` is a Catalog or LazyCatalog; by default the built-in inventory."""
+        self.products = catalog if catalog is not None else self._load_products()
         self.cart = ShoppingCart()
         self.is_running = True
 
     def _load_products(self):
         """Initializes the inventory of clothes."""
         print("👕👖 Loading the fashion inventory...")
-        time.sleep(1) # Added for a human touch
-        
-        # Dictionary to store products, mapping ID (int) to Product object
-        inventory = {
-            1: Product(1, "Classic Denim Jeans", "Bottoms", 49.99, 15),
-            2: Product(2, "Oversized Knit Sweater", "Tops", 34.50, 8),
-            3: Product(3, "Leather Biker Jacket", "Outerwear", 129.99, 4),
-            4: Product(4, "Striped Cotton T-Shirt", "Tops", 19.99, 25),
-            5: Product(5, "Wool Scarf (Navy)", "Accessories", 15.00, 30)
-        }
+
+        # The catalog indexes products by ID, category, price and stock
+        inventory = Catalog([
+            Product(1, "Classic Denim Jeans", "Bottoms", 49.99, 15),
+            Product(2, "Oversized Knit Sweater", "Tops", 34.50, 8),
+            Product(3, "Leather Biker Jacket", "Outerwear", 129.99, 4),
+            Product(4, "Striped Cotton T-Shirt", "Tops", 19.99, 25),
+            Product(5, "Wool Scarf (Navy)", "Accessories", 15.00, 30)
+        ])
         return inventory
 
     def _display_menu(self):
@@ -111,14 +879,49 @@ class ShoppingApp:
         print("3. View Shopping Cart & Total")
         print("4. Checkout (View Final Total & Exit)")
         print("5. Exit Application")
+        print("6. Filter Products (Category or Price)")
         print("="*40)
         
     def browse_products(self):
         """Displays all available products from the inventory."""
         print("\n--- Available Inventory ---")
-        for product in self.products.values():
-            if product.stock > 0:
+        offset = 0
+        while True:
+            page = self.products.in_stock(offset=offset, limit=self.PAGE_SIZE)
+            for product in page:
                 print(product)
+            offset += len(page)
+            if len(page) < self.PAGE_SIZE:
+                break
+            more = input("-- Press Enter for more products, or type q to stop: ").strip().lower()
+            if more == "q":
+                break
+        print("---------------------------\n")
+
+    def filter_products(self):
+        """Shows in-stock products from one category or within a price range."""
+        print(f"\nCategories: {', '.join(self.products.categories())}")
+        choice = input("Enter a category, or a price range like 10-50: ").strip()
+
+        try:
+            if "-" in choice:
+                low, high = (float(value) for value in choice.split("-", 1))
+                results = self.products.price_between(low, high)
+                heading = f"${low:.2f} to ${high:.2f}"
+            else:
+                # Match the category regardless of upper/lower case
+                matches = [name for name in self.products.categories() if name.lower() == choice.lower()]
+                results = self.products.by_category(matches[0]) if matches else []
+                heading = matches[0] if matches else choice
+        except ValueError:
+            print("❌ Invalid price range. Please use the form low-high, e.g. 10-50.")
+            return
+
+        print(f"\n--- {heading} ---")
+        if not results:
+            print("Nothing in stock here right now.")
+        for product in results:
+            print(product)
         print("---------------------------\n")
 
     def add_item_to_cart(self):
@@ -157,7 +960,8 @@ class ShoppingApp:
     def checkout(self):
         """Finalizes the shopping session."""
         print("\n🎉 Thank you for shopping with us!")
-        final_total = self.cart.calculate_total()
+        final_total = self.cart.view_details()
+        self.cart.checkout()
         if final_total > 0:
             print("Your order has been placed. Payment processed.")
         print("Goodbye! Come back soon for more great fashion.")
@@ -169,21 +973,23 @@ class ShoppingApp:
             self._display_menu()
             
             try:
-                choice = input("Enter your choice (1-5): ")
+                choice = input("Enter your choice (1-6): ")
                 
                 if choice == '1':
                     self.browse_products()
                 elif choice == '2':
                     self.add_item_to_cart()
                 elif choice == '3':
-                    self.cart.calculate_total()
+                    self.cart.view_details()
                 elif choice == '4':
                     self.checkout()
                 elif choice == '5':
                     print("\nExiting application. Your cart will not be saved.")
                     self.is_running = False
+                elif choice == '6':
+                    self.filter_products()
                 else:
-                    print("🚫 Invalid choice. Please select a number from 1 to 5.")
+                    print("🚫 Invalid choice. Please select a number from 1 to 6.")
                     
             except KeyboardInterrupt:
                 print("\n\nApplication interrupted by user. Exiting gracefully.")
@@ -191,9 +997,21 @@ class ShoppingApp:
             except Exception as e:
                 print(f"An unexpected system error occurred: {e}")
                 
-# --- 4. Execution Block ---
+# --- 7. Execution Block ---
 
 if __name__ == "__main__":
-    app = ShoppingApp()
-    app.run()
+    # python OnlineclothesShopping.py [catalog.sqlite | catalog.jsonl]
+    # python OnlineclothesShopping.py --benchmark | --cart-benchmark | --load-test
+    if "--benchmark" in sys.argv:
+        benchmark_startup()
+    elif "--cart-benchmark" in sys.argv:
+        benchmark_cart()
+    elif "--load-test" in sys.argv:
+        load_test_reservations()
+    elif len(sys.argv) > 1:
+        app = ShoppingApp(LazyCatalog(open_catalog_source(sys.argv[1])))
+        app.run()
+    else:
+        app = ShoppingApp()
+        app.run()
     
@@ -1,6 +1,215 @@
 # Simple To-Do List Program in Python (No Exception Handling)
+#
+# Tasks are saved in a file, so they are still there next time. Every task
+# gets an ID that never changes, plus a priority (1 = most urgent, 5 = can
+# wait) and, if you like, a due date.
+
+import heapq
+import json
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+TASKS_FILENAME = "tasks.jsonl"
+PAGE_SIZE = 20            # Tasks shown at a time
+DEFAULT_PRIORITY = 3
+NO_DUE_DATE = "9999-12-31"  # Sorts tasks without a due date last
+
+# The file is a log: one line per added task and one small "tombstone" line
+# per removed task, so adding or removing never rewrites the whole file.
+# Once there are more tombstones than tasks (and at least this many), the
+# file is rewritten with only the remaining tasks ("compaction").
+COMPACT_MIN_TOMBSTONES = 1000
+
+
+class _LazyHeap:
+    """
+    A heap of (key..., task ID) entries for finding the most urgent tasks
+    fast. Removed tasks are not dug out of the heap right away (that would
+    be slow); their entries are skipped when they come up, and the heap is
+    rebuilt once they make up more than half of it.
+    """
+    def __init__(self, key):
+        self.key = key      # task -> sort key
+        self.entries = []
+
+    def push(self, task):
+        heapq.heappush(self.entries, (self.key(task), task["id"]))
+
+    def rebuild(self, tasks):
+        self.entries = [(self.key(task), task["id"]) for task in tasks]
+        heapq.heapify(self.entries)
+
+    def smallest(self, count, tasks):
+        """The first `count` tasks in key order, without changing the heap."""
+        entries = self.entries
+        # Walk the heap from the top, always visiting the smallest entry seen
+        # so far: only about `count` entries (plus removed ones) are touched
+        frontier = [(entries[0], 0)] if entries else []
+        found = []
+        while frontier and len(found) < count:
+            (key, task_id), index = heapq.heappop(frontier)
+            if task_id in tasks:
+                found.append(tasks[task_id])
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(entries):
+                    heapq.heappush(frontier, (entries[child], child))
+        return found
+
+
+class TaskStore:
+    """
+    All tasks, kept in a dictionary by ID (in the order they were added) and
+    saved to a JSON-lines log file.
+
+    Adding and removing a task cost the same however many tasks there are,
+    and the most urgent tasks are found through heaps instead of sorting
+    the whole list.
+    """
+    def __init__(self, filename=TASKS_FILENAME):
+        self.filename = filename
+        self.tasks = {}           # task ID -> task
+        self.next_id = 1
+        self.tombstones = 0       # Removed tasks still mentioned in the file
+        self._batch = None        # Lines waiting for the end of a batch
+        self.by_priority = _LazyHeap(lambda task: (task["priority"], task["due"] or NO_DUE_DATE))
+        self.by_due_date = _LazyHeap(lambda task: (task["due"] or NO_DUE_DATE, task["priority"]))
+        self._load()
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def _load(self):
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, "rb") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # A line cut short by a crash
+                if record["op"] == "add":
+                    task = {key: record[key] for key in ("id", "title", "priority", "due")}
+                    self.tasks[task["id"]] = task
+                    self.next_id = max(self.next_id, task["id"] + 1)
+                elif record["op"] == "remove":
+                    self.tasks.pop(record["id"], None)
+                    self.tombstones += 1
+                elif record["op"] == "next_id":
+                    self.next_id = max(self.next_id, record["id"])
+        self.by_priority.rebuild(self.tasks.values())
+        self.by_due_date.rebuild(self.tasks.values())
+
+    def _write(self, records):
+        lines = "".join(json.dumps(record) + "\n" for record in records)
+        if self._batch is not None:
+            self._batch.append(lines)
+        else:
+            self._append(lines)
+
+    def _append(self, lines):
+        # Adds lines to the end of the file; only the end is touched
+        with open(self.filename, "a+b") as file:
+            # If a crash cut the last line short, start on a fresh line
+            if file.tell() > 0:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    file.write(b"\n")
+            file.write(lines.encode("utf-8"))
+            file.flush()
+            os.fsync(file.fileno())
+
+    @contextmanager
+    def batch(self):
+        """
+        Inside this block, changes are saved with one write at the end. It's
+        all or nothing: if the block fails, none of its changes are kept.
+        """
+        if self._batch is not None:
+            yield self  # Already in a batch
+            return
+        self._batch = []
+        try:
+            yield self
+        except BaseException:
+            # Forget the batch, and undo its changes in memory by reading
+            # back what's really in the file
+            self._batch = None
+            self.tasks, self.next_id, self.tombstones = {}, 1, 0
+            self._load()
+            self.by_priority.rebuild(self.tasks.values())
+            self.by_due_date.rebuild(self.tasks.values())
+            raise
+        lines, self._batch = self._batch, None
+        if lines:
+            self._append("".join(lines))
+        self._maybe_compact()
+
+    def add(self, title, priority=DEFAULT_PRIORITY, due=None):
+        """Adds a task and returns it. `due` is a date like 2025-12-31."""
+        task = {"id": self.next_id, "title": title, "priority": priority, "due": due}
+        self.next_id += 1
+        self.tasks[task["id"]] = task
+        self.by_priority.push(task)
+        self.by_due_date.push(task)
+        self._write([{"op": "add", **task}])
+        return task
+
+    def remove(self, task_id):
+        """Removes a task by its ID and returns it, or None if there's no such task."""
+        task = self.tasks.pop(task_id, None)
+        if task is None:
+            return None
+        self.tombstones += 1
+        self._write([{"op": "remove", "id": task_id}])
+        self._maybe_compact()
+        return task
+
+    def page(self, offset=0, limit=PAGE_SIZE):
+        """Tasks in the order they were added, one page at a time."""
+        return list(islice(self.tasks.values(), offset, offset + limit))
+
+    def next_up(self, count=PAGE_SIZE):
+        """The most urgent tasks: highest priority first, then earliest due date."""
+        return self.by_priority.smallest(count, self.tasks)
+
+    def due_soon(self, count=PAGE_SIZE):
+        """The tasks that are due first (tasks without a due date come last)."""
+        return self.by_due_date.smallest(count, self.tasks)
+
+    def _maybe_compact(self):
+        if self._batch is None and self.tombstones > max(COMPACT_MIN_TOMBSTONES, len(self.tasks)):
+            self.compact()
+        elif len(self.by_priority.entries) > 2 * max(len(self.tasks), COMPACT_MIN_TOMBSTONES):
+            self.by_priority.rebuild(self.tasks.values())
+            self.by_due_date.rebuild(self.tasks.values())
+
+    def compact(self):
+        """Rewrites the file with only the remaining tasks, safely."""
+        temporary = self.filename + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            # Remember the next ID, so IDs of removed tasks are never reused
+            file.write(json.dumps({"op": "next_id", "id": self.next_id}) + "\n")
+            for task in self.tasks.values():
+                file.write(json.dumps({"op": "add", **task}) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.filename)
+        self.tombstones = 0
+        self.by_priority.rebuild(self.tasks.values())
+        self.by_due_date.rebuild(self.tasks.values())
+
+
+todo_list = None  # The TaskStore, opened when the program starts
+
+
+def _describe(task):
+    due = f", due {task['due']}" if task["due"] else ""
+    return f"#{task['id']} {task['title']} (priority {task['priority']}{due})"
 
-todo_list = []  # Store tasks here
 
 def show_menu():
     print("\n===== TO-DO LIST MENU =====")
@@ -8,43 +217,286 @@ def show_menu():
     print("2. Add task")
     print("3. Remove task")
     print("4. Exit")
+    print("5. What's next (by priority and due date)")
 
 def view_tasks():
-    if not todo_list:
+    if not len(todo_list):
         print("\nNo tasks in the list!")
     else:
-        print("\nYour tasks:")
-        for i, task in enumerate(todo_list, start=1):
-            print(f"{i}. {task}")
+        print(f"\nYour tasks ({len(todo_list)}):")
+        # Walk the tasks one page at a time, without copying the whole list
+        tasks = iter(todo_list.tasks.values())
+        shown = 0
+        while True:
+            for task in islice(tasks, PAGE_SIZE):
+                print(_describe(task))
+                shown += 1
+            if shown >= len(todo_list):
+                break
+            more = input("-- Press Enter for more tasks, or type q to stop: ").strip().lower()
+            if more == "q":
+                break
 
 def add_task():
     task = input("\nEnter new task: ")
-    todo_list.append(task)
+    priority = input(f"Priority 1 (urgent) to 5 (can wait) [{DEFAULT_PRIORITY}]: ").strip()
+    due = input("Due date (YYYY-MM-DD, or leave empty): ").strip()
+    todo_list.add(task, int(priority) if priority else DEFAULT_PRIORITY, due or None)
     print("✅ Task added!")
 
 def remove_task():
     view_tasks()
-    if todo_list:
-        task_num = int(input("\nEnter task number to remove: "))
-        if 1 <= task_num <= len(todo_list):
-            removed = todo_list.pop(task_num - 1)
-            print(f"❌ Removed task: {removed}")
+    if len(todo_list):
+        task_id = int(input("\nEnter task number to remove: ").lstrip("#"))
+        removed = todo_list.remove(task_id)
+        if removed is not None:
+            print(f"❌ Removed task: {removed['title']}")
         else:
             print("Invalid task number!")
 
-# Main loop
-while True:
-    show_menu()
-    choice = input("\nChoose an option (1-4): ")
-
-    if choice == "1":
-        view_tasks()
-    elif choice == "2":
-        add_task()
-    elif choice == "3":
-        remove_task()
-    elif choice == "4":
-        print("Goodbye! 👋")
-        break
+def show_next_tasks():
+    tasks = todo_list.next_up(10)
+    if not tasks:
+        print("\nNo tasks in the list!")
+    else:
+        print("\nDo these first:")
+        for task in tasks:
+            print(_describe(task))
+
+
+# --- Batch Mode ---
+# Load a whole backlog at once, or export the list, without any menus:
+#   python TODO_List.py --import backlog.txt     (or '-' for stdin)
+#   python TODO_List.py --export tasks.txt --format jsonl
+#
+# Text lines look like "Buy milk | 1 | 2025-12-31" (priority and due date
+# are optional), or "remove 12" to remove task #12. In a title, "\|" is a
+# "|", "\n" a new line and "\\" a backslash. A backslash also keeps a title
+# from being read as a command or as JSON: "a\dd 2 tests", "\{draft}".
+# Spaces around a title are trimmed, so only jsonl keeps every title exactly.
+# JSON lines look like {"title": "Buy milk", "priority": 1, "due": "2025-12-31"}
+# or {"op": "remove", "id": 12}.
+#
+# An import is all or nothing: if any line can't be read, no task is added
+# or removed.
+
+TASK_FORMATS = ("text", "jsonl")
+STREAM_BUFFER_BYTES = 1 << 20
+
+
+def _open_stream(path, mode):
+    """Opens a file, or stdin/stdout for '-', with a big buffer."""
+    if path == "-":
+        return open((sys.stdin if mode == "r" else sys.stdout).fileno(), mode,
+                    encoding="utf-8", closefd=False, buffering=STREAM_BUFFER_BYTES)
+    return open(path, mode, encoding="utf-8", buffering=STREAM_BUFFER_BYTES)
+
+
+def _escape_title(title):
+    """Writes a title so read_commands() reads it back as the very same title."""
+    text = title.replace("\\", "\\\\").replace("\n", "\\n").replace("\r", "\\r").replace("|", "\\|")
+    if text.startswith("{"):
+        text = "\\" + text
+    if re.match(r"(add|remove)(\s|$)", text, re.IGNORECASE):
+        # "a\dd 2 tests" no longer starts with the word "add"
+        text = text[0] + "\\" + text[1:]
+    return text
+
+
+def _unescape_title(text):
+    return re.sub(r"\\(.)", lambda match: {"n": "\n", "r": "\r"}.get(match[1], match[1]), text)
+
+
+def _read_command(line, format):
+    if format == "jsonl" or (format is None and line.startswith("{")):
+        record = json.loads(line)
+        if record.get("op", "add") == "remove":
+            return ("remove", int(record["id"]))
+        return ("add", record["title"], int(record.get("priority") or DEFAULT_PRIORITY),
+                record.get("due") or None)
+
+    words = line.split(None, 1)
+    if len(words) == 2 and words[0].lower() == "remove" and words[1].lstrip("#").isdigit():
+        return ("remove", int(words[1].lstrip("#")))
+    if len(words) == 2 and words[0].lower() == "add":
+        line = words[1]
+    # Fields are split on a "|" with space before it, so an escaped "\|"
+    # never splits, and a line ending in " |" (no due date) still reads
+    fields = [field.strip() for field in re.split(r"\s+\|(?:\s+|$)", line)]
+    if len(fields) > 3:
+        raise ValueError("too many ' | ' fields")
+    priority = int(fields[1]) if len(fields) > 1 and fields[1] else DEFAULT_PRIORITY
+    due = fields[2] if len(fields) > 2 and fields[2] else None
+    return ("add", _unescape_title(fields[0]), priority, due)
+
+
+def read_commands(lines, format=None):
+    """
+    Turns lines of text or JSON into commands, one at a time:
+    ("add", title, priority, due) or ("remove", task ID). Without a format,
+    lines starting with "{" are read as JSON and the rest as text. A line
+    that can't be read raises ValueError saying which line it was.
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            command = _read_command(line, format)
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            raise ValueError(f"line {number} ({line[:60]!r}) can't be read: {error}") from None
+        yield command
+
+
+def apply_commands(store, commands):
+    """
+    Runs add/remove commands on the store, saving everything with one write
+    at the end. Returns how many tasks were added, removed, and how many
+    removes named a task that doesn't exist.
+    """
+    added = removed = missing = 0
+    with store.batch():
+        for command in commands:
+            if command[0] == "add":
+                store.add(*command[1:])
+                added += 1
+            elif store.remove(command[1]) is not None:
+                removed += 1
+            else:
+                missing += 1
+    return added, removed, missing
+
+
+def export_tasks(store, output, format="text"):
+    """Writes every task to `output`, one line each, in a format --import reads back."""
+    for task in store.tasks.values():
+        if format == "jsonl":
+            output.write(json.dumps({"id": task["id"], "title": task["title"],
+                                     "priority": task["priority"], "due": task["due"]}) + "\n")
+        else:
+            due = f" | {task['due']}" if task["due"] else ""
+            output.write(f"{_escape_title(task['title'])} | {task['priority']}{due}\n")
+
+
+def batch_main(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="📝 To-do list – batch mode")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--import", dest="source", metavar="FILE",
+                      help="add/remove tasks from a file ('-' for stdin)")
+    mode.add_argument("--export", dest="target", metavar="FILE",
+                      help="write all tasks to a file ('-' for stdout)")
+    mode.add_argument("--benchmark", action="store_true",
+                      help="time view, add, remove, import and export with 100k tasks")
+    parser.add_argument("--format", choices=TASK_FORMATS, default=None,
+                        help="line format (default: text for export, detected per line for import)")
+    parser.add_argument("--tasks", default=TASKS_FILENAME,
+                        help=f"the task file to use (default: {TASKS_FILENAME})")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        benchmark_tasks()
+        return
+    store = TaskStore(args.tasks)
+    if args.source:
+        try:
+            with _open_stream(args.source, "r") as source:
+                added, removed, missing = apply_commands(store, read_commands(source, args.format))
+        except ValueError as error:
+            print(f"🚫 Nothing was imported: {error}", file=sys.stderr)
+            sys.exit(1)
+        print(f"✅ Added {added} task(s), removed {removed}"
+              + (f", {missing} to remove weren't found" if missing else "")
+              + f". {len(store)} task(s) in the list.", file=sys.stderr)
+    else:
+        with _open_stream(args.target, "w") as output:
+            export_tasks(store, output, args.format or "text")
+
+
+def benchmark_tasks(size=100000, operations=1000):
+    """How long view, add and remove take with `size` tasks in the list."""
+    import random
+    import tempfile
+
+    chooser = random.Random(3)
+    with tempfile.TemporaryDirectory() as folder:
+        store = TaskStore(os.path.join(folder, TASKS_FILENAME))
+        start = time.perf_counter()
+        with store.batch():
+            for number in range(size):
+                store.add(f"Task {number}", chooser.randint(1, 5),
+                          f"2025-{chooser.randint(1, 12):02d}-{chooser.randint(1, 28):02d}")
+        print(f"📏 {size:,} tasks added in one batch: {time.perf_counter() - start:.2f} s")
+
+        start = time.perf_counter()
+        store = TaskStore(store.filename)
+        print(f"  reopen            {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+        def timed(label, action):
+            start = time.perf_counter()
+            for _ in range(operations):
+                action()
+            print(f"  {label:<17} {(time.perf_counter() - start) / operations * 1e6:9.1f} µs each")
+
+        timed("view first page", lambda: store.page(0, PAGE_SIZE))
+        timed("view next up", lambda: store.next_up(PAGE_SIZE))
+        timed("add (fsync'd)", lambda: store.add("One more", 2))
+        ids = chooser.sample(list(store.tasks), operations)
+        timed("remove (fsync'd)", lambda: store.remove(ids.pop()))
+
+        exported = os.path.join(folder, "export.jsonl")
+        start = time.perf_counter()
+        with _open_stream(exported, "w") as output:
+            export_tasks(store, output, "jsonl")
+        print(f"  export            {len(store) / (time.perf_counter() - start):9,.0f} tasks/sec")
+
+        fresh = TaskStore(os.path.join(folder, "imported.jsonl"))
+        start = time.perf_counter()
+        with _open_stream(exported, "r") as source:
+            apply_commands(fresh, read_commands(source))
+        print(f"  import            {len(fresh) / (time.perf_counter() - start):9,.0f} tasks/sec (one write)")
+
+        # Both formats must read back as the very same tasks
+        same = True
+        for format in TASK_FORMATS:
+            path = os.path.join(folder, f"roundtrip.{format}")
+            with _open_stream(path, "w") as output:
+                export_tasks(store, output, format)
+            copy = TaskStore(os.path.join(folder, f"roundtrip-{format}.jsonl"))
+            with _open_stream(path, "r") as source:
+                apply_commands(copy, read_commands(source, format))
+            same &= ([(task["title"], task["priority"], task["due"]) for task in copy.tasks.values()]
+                     == [(task["title"], task["priority"], task["due"]) for task in store.tasks.values()])
+        print("✅ Text and jsonl exports read back unchanged." if same else "❌ An export didn't read back the same!")
+
+
+def main():
+    global todo_list
+    todo_list = TaskStore()
+
+    # Main loop
+    while True:
+        show_menu()
+        choice = input("\nChoose an option (1-5): ")
+
+        if choice == "1":
+            view_tasks()
+        elif choice == "2":
+            add_task()
+        elif choice == "3":
+            remove_task()
+        elif choice == "4":
+            print("Goodbye! 👋")
+            break
+        elif choice == "5":
+            show_next_tasks()
+        else:
+            print("Invalid choice! Please try again.")
+
+
+if __name__ == "__main__":
+    if {"--import", "--export", "--benchmark"} & set(sys.argv):
+        batch_main(sys.argv[1:])
     else:
-        print("Invalid choice! Please try again.")
+        main()
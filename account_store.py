@@ -0,0 +1,248 @@
+"""
+Account Store
+
+Purpose:
+One place that holds the data of every bank account, shared by both bank
+programs in this repo: `simple_bank_system.bank` and
+`bank_system_withSecurity.BankAccount` are thin views onto it.
+
+Instead of one Python object (with its own attribute dictionary) per
+account, the store keeps each field in a column: one compact array of
+balances, one list of holder names, and so on. Account number N lives in
+the same slot of every column, and a dictionary finds the slot of an
+account number in O(1). That way millions of accounts fit in memory.
+
+Balances are kept in whole paise, so money never picks up floating-point
+crumbs.
+"""
+
+import sys          # To spot the --benchmark option
+import threading    # To keep balance changes safe across threads
+import time         # For the benchmark
+from array import array  # Compact, growable columns of numbers
+from contextlib import contextmanager
+
+PAISE_PER_RUPEE = 100
+
+
+def to_paise(rupees):
+    return int(round(rupees * PAISE_PER_RUPEE))
+
+
+def to_rupees(paise):
+    # Whole rupees come back as ints, anything else as a float
+    return paise // PAISE_PER_RUPEE if paise % PAISE_PER_RUPEE == 0 else paise / PAISE_PER_RUPEE
+
+
+class AccountStore:
+    """
+    Columnar storage for bank accounts.
+
+    Every account has a slot (0, 1, 2, ...). Its account number, holder,
+    account type and balance sit at that slot in the matching column.
+    Balance changes are guarded by a fixed set of "striped" locks, so
+    accounts in different stripes never wait for each other.
+    """
+    def __init__(self, stripes=64):
+        self._slots = {}              # account number -> slot
+        self.numbers = []             # slot -> account number (None if it has none)
+        self.holders = []             # slot -> holder name
+        self.kinds = array("B")       # slot -> index into self.kind_names
+        self.kind_names = []          # e.g. ["", "Savings", "Current"]
+        self._kind_ids = {}
+        self.balances = array("q")    # slot -> balance in paise
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._open_lock = threading.Lock()
+        self._free = []               # slots of closed accounts, to reuse
+
+    def __len__(self):
+        return len(self.numbers) - len(self._free)
+
+    def __contains__(self, account_number):
+        return account_number in self._slots
+
+    def open(self, account_number=None, holder="", kind="", balance=0):
+        """
+        Adds an account and returns its slot (reusing a closed account's
+        slot if there is one). An account opened without a number can only
+        be reached through its slot: it never shares the numbered accounts'
+        keyspace, so no number can ever land on it. Opening a number that
+        is already open raises ValueError.
+        """
+        with self._open_lock:
+            if account_number is not None and account_number in self._slots:
+                raise ValueError(f"Account {account_number} already exists")
+            kind_id = self._kind_ids.get(kind)
+            if kind_id is None:
+                kind_id = self._kind_ids[kind] = len(self.kind_names)
+                self.kind_names.append(kind)
+
+            if self._free:
+                # Reuse the slot of a closed account
+                slot = self._free.pop()
+                self.numbers[slot] = account_number
+                self.holders[slot] = holder
+                self.kinds[slot] = kind_id
+                self.balances[slot] = to_paise(balance)
+            else:
+                slot = len(self.numbers)
+                self.numbers.append(account_number)
+                self.holders.append(holder)
+                self.kinds.append(kind_id)
+                self.balances.append(to_paise(balance))
+            if account_number is not None:
+                self._slots[account_number] = slot
+            return slot
+
+    def close(self, slot):
+        """
+        Closes the account in a slot: its number is free to open again and
+        the slot is reused by the next account opened, so a long-running
+        program doesn't keep growing.
+        """
+        with self._open_lock:
+            number = self.numbers[slot]
+            if number is not None:
+                del self._slots[number]
+            self.numbers[slot] = None
+            self.holders[slot] = ""
+            self.balances[slot] = 0
+            self._free.append(slot)
+
+    def slot(self, account_number):
+        """The slot of an account number; KeyError if there's no such account."""
+        return self._slots[account_number]
+
+    def lock_for(self, slot):
+        return self._locks[slot % len(self._locks)]
+
+    def locks_for(self, *slots):
+        """The locks of several slots, each once, in a fixed order (so no deadlocks)."""
+        stripes = sorted({slot % len(self._locks) for slot in slots})
+        return [self._locks[stripe] for stripe in stripes]
+
+    @contextmanager
+    def locked(self):
+        """
+        Holds every lock of the store inside a with block: no account is
+        opened and no balance changes until it ends. For bulk work straight
+        on the balances column (e.g. a NumPy view of it).
+        """
+        with self._open_lock:
+            for lock in self._locks:
+                lock.acquire()
+            try:
+                yield self
+            finally:
+                for lock in reversed(self._locks):
+                    lock.release()
+
+    def kind(self, slot):
+        return self.kind_names[self.kinds[slot]]
+
+    def balance(self, slot):
+        """The balance of a slot in rupees."""
+        return to_rupees(self.balances[slot])
+
+    def set_balance(self, slot, rupees):
+        self.balances[slot] = to_paise(rupees)
+
+    # Quick operations straight on the columns, without any account objects
+
+    def deposit(self, account_number, amount):
+        """Adds money; returns the new balance, or None if the amount is invalid."""
+        if not amount > 0:
+            return None
+        slot = self._slots[account_number]
+        with self.lock_for(slot):
+            self.balances[slot] += to_paise(amount)
+            return to_rupees(self.balances[slot])
+
+    def withdraw(self, account_number, amount):
+        """Takes money out; returns the new balance, or None if it can't."""
+        slot = self._slots[account_number]
+        paise = to_paise(amount)
+        with self.lock_for(slot):
+            if not 0 < paise <= self.balances[slot]:
+                return None
+            self.balances[slot] -= paise
+            return to_rupees(self.balances[slot])
+
+
+# The store every account uses unless it's given its own
+DEFAULT_STORE = AccountStore()
+
+
+def benchmark_store(accounts=1000000, operations=1000000):
+    """Memory per account and operations per second: columnar store vs one object per account."""
+    import contextlib
+    import io
+    import random
+    import tracemalloc
+
+    class PerObjectAccount:
+        # How an account was kept before: one object with its own __dict__
+        def __init__(self, number, holder, kind, balance):
+            self.number = number
+            self.holder = holder
+            self.kind = kind
+            self.balance = balance
+
+    numbers = [f"AC{number:010d}" for number in range(accounts)]
+    holders = [f"Holder {number}" for number in range(accounts)]
+    chooser = random.Random(1)
+    picks = [chooser.randrange(accounts) for _ in range(operations)]
+
+    print(f"📏 {accounts:,} accounts, {operations:,} deposits + withdrawals")
+
+    # Both sides share the same number and holder strings, so only the
+    # per-account overhead is measured
+    tracemalloc.start()
+    objects = {number: PerObjectAccount(number, holder, "Savings", 1000)
+               for number, holder in zip(numbers, holders)}
+    object_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    store = AccountStore()
+    for number, holder in zip(numbers, holders):
+        store.open(number, holder, "Savings", 1000)
+    store_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for pick in picks:
+        account = objects[numbers[pick]]
+        account.balance += 5
+        if account.balance >= 5:
+            account.balance -= 5
+    object_rate = 2 * operations / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for pick in picks:
+        store.deposit(numbers[pick], 5)
+        store.withdraw(numbers[pick], 5)
+    store_rate = 2 * operations / (time.perf_counter() - start)
+
+    print(f"  one object each  {object_bytes / accounts:6.0f} bytes/account  {object_rate:12,.0f} ops/sec (no locks)")
+    print(f"  columnar store   {store_bytes / accounts:6.0f} bytes/account  {store_rate:12,.0f} ops/sec (thread-safe)")
+
+    # The two bank programs, now thin views on a store
+    from bank_system_withSecurity import BankAccount
+    from simple_bank_system import bank
+
+    sample = min(accounts, 100000)
+    for label, make in (("simple_bank_system.bank", lambda number, shared: bank(number, "Savings", 0, store=shared)),
+                        ("BankAccount", lambda number, shared: BankAccount(number, "Holder", 1000, store=shared))):
+        shared = AccountStore()
+        facades = [make(number, shared) for number in numbers[:1000]]
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for pick in picks[:sample]:
+                facades[pick % len(facades)].deposit(5)
+        rate = sample / (time.perf_counter() - start)
+        print(f"  {label:<24} {rate:12,.0f} deposits/sec through the facade (with printing)")
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark_store()
@@ -1,22 +1,413 @@
+import json
+import os
+import sys
+import threading
+import time
+from decimal import Decimal
+
+from account_store import DEFAULT_STORE, PAISE_PER_RUPEE, AccountStore, to_paise, to_rupees
+from output_sinks import SilentSink, emit, use_sink
+
+try:
+    import numpy as np
+except ImportError:  # Only bulk interest posting needs NumPy
+    np = None
+
+# Money is counted in whole paise and interest rates in ten-thousandths of
+# a percent, so interest works out the same every time, to the paisa.
+RATE_SCALE = 10 ** 4             # 4.5% is stored as 45000
+_RATE_DIVISOR = 100 * RATE_SCALE
+
+
+def rate_units(percent):
+    return int(Decimal(str(percent)) * RATE_SCALE)
+
+
+def interest_paise(balance_paise, rate):
+    """
+    Interest on a balance in paise at `rate` (in rate units), rounded half up
+    to the nearest paisa. Splitting the balance first keeps every product
+    small, so the NumPy version below never overflows 64-bit integers.
+    """
+    whole, part = divmod(balance_paise, _RATE_DIVISOR)
+    return whole * rate + (2 * part * rate + _RATE_DIVISOR) // (2 * _RATE_DIVISOR)
+
+
+# --- The Ledger ---
+# Every deposit, withdrawal and interest payment is written to a
+# write-ahead log (WAL) before the operation returns, so balances survive a
+# restart and every account has a history.
+#
+# Writing a transaction to disk safely needs an fsync, which is slow. So
+# transactions are written in groups ("group commit"): a background writer
+# takes everything that is waiting, writes it in one go and fsyncs once for
+# the whole group.
+#
+# The ledger folder holds:
+#   snapshot.json         balances up to some transaction number
+#   wal-<first seq>.log   the transactions, one JSON object per line
+# On startup the snapshot is loaded and the WAL after it is replayed.
+
+SNAPSHOT_FILENAME = "snapshot.json"
+WAL_PREFIX = "wal-"
+WAL_SUFFIX = ".log"
+
+
+def _fsync_folder(folder):
+    # Makes a rename or a new file in `folder` itself survive a crash
+    if hasattr(os, "O_DIRECTORY"):
+        descriptor = os.open(folder, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+
+class Ledger:
+    """
+    A durable, append-only record of every transaction.
+
+    With sync=True (the default) an operation only returns once its
+    transaction is safely on disk. Many threads waiting at the same time
+    share one fsync. With sync=False operations return right away and are
+    written within `max_delay` seconds; call flush() to wait for them.
+    """
+    def __init__(self, folder, sync=True, max_delay=0.005):
+        self.folder = folder
+        self.sync = sync
+        self.max_delay = max_delay
+        self.lock = threading.Lock()      # Keeps transactions in order
+        self.balances = {}                # account number -> balance
+        self.holders = {}                 # account number -> holder name
+        self.last_seq = 0                 # Number of the newest transaction
+        self.snapshot_seq = 0             # Newest transaction in the snapshot
+
+        os.makedirs(folder, exist_ok=True)
+        self._recover()
+
+        self._pending = []                # (seq, encoded line) not yet written
+        self._durable_seq = self.last_seq
+        self._error = None
+        self._closed = False
+        self._queue_lock = threading.Lock()
+        self._work = threading.Condition(self._queue_lock)    # Wakes the writer
+        self._written = threading.Condition(self._queue_lock) # Wakes waiting operations
+        self._wal = open(self._segments()[-1][1], "ab")
+        self._writer = threading.Thread(target=self._write_groups, name="ledger-writer", daemon=True)
+        self._writer.start()
+
+    # -- Recovery --
+
+    def _segments(self):
+        """The WAL files as (first seq, path), oldest first. Makes one if there are none."""
+        segments = sorted((int(name[len(WAL_PREFIX):-len(WAL_SUFFIX)]), os.path.join(self.folder, name))
+                          for name in os.listdir(self.folder)
+                          if name.startswith(WAL_PREFIX) and name.endswith(WAL_SUFFIX))
+        if not segments:
+            path = os.path.join(self.folder, f"{WAL_PREFIX}{self.last_seq + 1:012d}{WAL_SUFFIX}")
+            open(path, "ab").close()
+            _fsync_folder(self.folder)
+            segments = [(self.last_seq + 1, path)]
+        return segments
+
+    def _recover(self):
+        """Loads the snapshot, then replays the transactions written after it."""
+        snapshot_path = os.path.join(self.folder, SNAPSHOT_FILENAME)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path) as file:
+                snapshot = json.load(file)
+            self.snapshot_seq = self.last_seq = snapshot["seq"]
+            self.balances = snapshot["balances"]
+            self.holders = snapshot["holders"]
+
+        segments = self._segments()
+        for number, (first_seq, path) in enumerate(segments):
+            # A segment whose successor starts inside the snapshot is fully covered
+            if number + 1 < len(segments) and segments[number + 1][0] <= self.snapshot_seq + 1:
+                continue
+            for record in self._read_segment(path, repair=number + 1 == len(segments)):
+                if record["seq"] > self.last_seq:
+                    self._apply(record)
+
+    @staticmethod
+    def _read_segment(path, repair=False):
+        """
+        Reads the records of one WAL file. A crash can leave a half-written
+        last line; it never reached the disk completely, so it was never
+        confirmed. With repair=True that torn tail is cut off.
+        """
+        records, good_bytes = [], 0
+        with open(path, "rb") as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+                good_bytes += len(line)
+        if repair and good_bytes < os.path.getsize(path):
+            with open(path, "r+b") as file:
+                file.truncate(good_bytes)
+                os.fsync(file.fileno())
+        return records
+
+    def _apply(self, record):
+        self.last_seq = record["seq"]
+        self.balances[record["account"]] = record["balance"]
+        if "holder" in record:
+            self.holders[record["account"]] = record["holder"]
+        if "to" in record:
+            self.balances[record["to"]] = record["to_balance"]
+
+    # -- Writing --
+
+    def append(self, account_number, kind, amount, balance, holder=None, to=None, to_balance=None):
+        """
+        Adds one transaction and returns its number. Call it while holding
+        `lock`, together with the balance change, so the ledger order is
+        the order the balances really changed in.
+        """
+        if self._error is not None:
+            raise self._error
+        self.last_seq += 1
+        record = {"seq": self.last_seq, "account": account_number, "kind": kind,
+                  "amount": amount, "balance": balance}
+        if holder is not None:
+            record["holder"] = holder
+        if to is not None:
+            # A transfer: both accounts' new balances are in this one record
+            record["to"], record["to_balance"] = to, to_balance
+        self._apply(record)
+        line = json.dumps(record).encode("utf-8") + b"\n"
+        with self._queue_lock:
+            self._pending.append((self.last_seq, line))
+            self._work.notify()
+        return self.last_seq
+
+    def wait(self, seq):
+        """Blocks until transaction `seq` is on disk (only with sync=True)."""
+        if self.sync:
+            self._wait_durable(seq)
+
+    def flush(self):
+        """Blocks until every transaction so far is on disk."""
+        self._wait_durable(self.last_seq)
+
+    def _wait_durable(self, seq):
+        with self._queue_lock:
+            while self._durable_seq < seq and self._error is None:
+                self._written.wait()
+        if self._error is not None:
+            raise self._error
+
+    def _write_groups(self):
+        """The background writer: one write and one fsync per group."""
+        while True:
+            with self._queue_lock:
+                while not self._pending and not self._closed:
+                    self._work.wait()
+                if not self._pending and self._closed:
+                    return
+            if not self.sync:
+                time.sleep(self.max_delay)  # Let a bigger group gather
+            with self._queue_lock:
+                group, self._pending = self._pending, []
+            try:
+                self._wal.write(b"".join(line for _, line in group))
+                self._wal.flush()
+                os.fsync(self._wal.fileno())
+            except OSError as error:
+                with self._queue_lock:
+                    self._error = error
+                    self._written.notify_all()
+                return
+            with self._queue_lock:
+                self._durable_seq = group[-1][0]
+                self._written.notify_all()
+
+    def checkpoint(self):
+        """
+        Saves all balances to the snapshot and starts a new WAL file, so the
+        next startup only has to replay what happens from now on. Old WAL
+        files are kept as history.
+        """
+        with self.lock:
+            self.flush()
+            snapshot_path = os.path.join(self.folder, SNAPSHOT_FILENAME)
+            temporary = snapshot_path + ".tmp"
+            with open(temporary, "w") as file:
+                json.dump({"seq": self.last_seq, "balances": self.balances, "holders": self.holders}, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary, snapshot_path)
+            self.snapshot_seq = self.last_seq
+
+            self._wal.close()
+            path = os.path.join(self.folder, f"{WAL_PREFIX}{self.last_seq + 1:012d}{WAL_SUFFIX}")
+            self._wal = open(path, "ab")
+            _fsync_folder(self.folder)
+
+    def history(self, account_number):
+        """Every transaction of one account, oldest first."""
+        self.flush()
+        return [record
+                for _, path in self._segments()
+                for record in self._read_segment(path)
+                if account_number in (record["account"], record.get("to"))]
+
+    def close(self, checkpoint=True):
+        """Writes everything out, optionally saves a snapshot, and stops the writer."""
+        if checkpoint:
+            self.checkpoint()
+        else:
+            self.flush()
+        with self._queue_lock:
+            self._closed = True
+            self._work.notify()
+        self._writer.join()
+        self._wal.close()
+
+
 class BankAccount:
-    def __init__(self, account_number, holder_name, initial_balance):
-        self.account_number = account_number       # Public
-        self._holder_name = holder_name            # Protected
-        self.__balance = initial_balance           # Private
+    # The account's data lives in an AccountStore; this object is just a
+    # small view onto its slot there
+    __slots__ = ("store", "slot", "ledger")
+
+    def __init__(self, account_number, holder_name, initial_balance, ledger=None, store=None):
+        self.store = store if store is not None else DEFAULT_STORE
+        self.slot = self.store.open(account_number, holder_name, "", initial_balance)
+        self.ledger = ledger
+
+        if ledger is not None:
+            with ledger.lock:
+                if account_number in ledger.balances:
+                    # A known account: its balance comes from the ledger
+                    self.__balance = ledger.balances[account_number]
+                    seq = None
+                else:
+                    seq = ledger.append(account_number, "open", initial_balance,
+                                        initial_balance, holder=holder_name)
+            if seq is not None:
+                ledger.wait(seq)
+
+    def __del__(self):
+        # The account object is gone: give its slot (and number) back to the
+        # store. If __init__ failed before opening one, there's nothing to free.
+        slot = getattr(self, "slot", None)
+        if slot is not None:
+            self.store.close(slot)
+
+    @property
+    def account_number(self):                      # Public
+        return self.store.numbers[self.slot]
+
+    @property
+    def _holder_name(self):                        # Protected
+        return self.store.holders[self.slot]
+
+    @property
+    def __balance(self):                           # Private
+        return self.store.balance(self.slot)
+
+    @__balance.setter
+    def __balance(self, rupees):
+        self.store.set_balance(self.slot, rupees)
+
+    @property
+    def _lock(self):
+        # Checking the balance and changing it happen together under this
+        # lock, so two withdrawals at once can never overdraw the account
+        return self.store.lock_for(self.slot)
+
+    def _post(self, kind, change, amount):
+        # Changes the balance and records it in the ledger in one step.
+        # Call it holding self._lock; returns the new balance and the
+        # ledger seq to wait for.
+        store, slot = self.store, self.slot
+        if self.ledger is None:
+            store.balances[slot] += to_paise(change)
+            return store.balance(slot), None
+        with self.ledger.lock:
+            store.balances[slot] += to_paise(change)
+            balance = store.balance(slot)
+            return balance, self.ledger.append(self.account_number, kind, amount, balance)
+
+    def _wait(self, seq):
+        # Waits for the ledger outside the account lock, so other threads can
+        # keep using the account and join the same group commit
+        if seq is not None:
+            self.ledger.wait(seq)
+
+    def _deposit(self, amount, kind="deposit"):
+        """Adds money atomically. Returns the new balance, or None if the amount is invalid."""
+        if not amount > 0:
+            return None
+        with self._lock:
+            balance, seq = self._post(kind, amount, amount)
+        self._wait(seq)
+        return balance
+
+    def _withdraw(self, amount):
+        """Takes money out atomically. Returns the new balance, or None if it can't."""
+        with self._lock:
+            if not 0 < amount <= self.__balance:
+                return None
+            balance, seq = self._post("withdraw", -amount, amount)
+        self._wait(seq)
+        return balance
+
+    def transfer_to(self, other, amount):
+        """
+        Moves money to another account in the same store, all or nothing.
+        Both accounts' locks are taken in a fixed order, so two transfers
+        going opposite ways can never wait for each other forever.
+        """
+        if other.store is not self.store:
+            raise ValueError("Transfers only work between accounts in the same store")
+        if other is self or not amount > 0:
+            return False
+        # Accounts can share a lock stripe; locks_for() gives each lock once, in order
+        locks = self.store.locks_for(self.slot, other.slot)
+        for lock in locks:
+            lock.acquire()
+        try:
+            if amount > self.__balance:
+                return False
+            if self.ledger is None:
+                self.__balance -= amount
+                other.__balance += amount
+                return True
+            # Both sides go into the ledger as one record, so a crash can't
+            # keep only half of a transfer
+            with self.ledger.lock:
+                self.__balance -= amount
+                other.__balance += amount
+                seq = self.ledger.append(self.account_number, "transfer", amount, self.__balance,
+                                         to=other.account_number, to_balance=other.__balance)
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+        self._wait(seq)
+        return True
+
+    # deposit() and withdraw() report through the current output sink (see
+    # output_sinks.py) and return the Event, which is truthy if it worked
 
     def deposit(self, amount):
-        if amount > 0:
-            self.__balance += amount
-            print(f"₹{amount} deposited. New balance: ₹{self.__balance}")
-        else:
-            print("Invalid deposit amount.")
+        balance = self._deposit(amount)
+        if balance is not None:
+            return emit("deposit", True, "₹{amount} deposited. New balance: ₹{balance}",
+                        account=self.account_number, amount=amount, balance=balance)
+        return emit("deposit", False, "Invalid deposit amount.", account=self.account_number, amount=amount)
 
     def withdraw(self, amount):
-        if 0 < amount <= self.__balance:
-            self.__balance -= amount
-            print(f"₹{amount} withdrawn. Remaining balance: ₹{self.__balance}")
-        else:
-            print("Insufficient balance or invalid amount.")
+        balance = self._withdraw(amount)
+        if balance is not None:
+            return emit("withdraw", True, "₹{amount} withdrawn. Remaining balance: ₹{balance}",
+                        account=self.account_number, amount=amount, balance=balance)
+        return emit("withdraw", False, "Insufficient balance or invalid amount.",
+                    account=self.account_number, amount=amount)
 
     def get_balance(self):
         return self.__balance
@@ -27,14 +418,22 @@ class BankAccount:
 
 # Subclass with limited access to parent class members
 class SavingsAccount(BankAccount):
-    def __init__(self, account_number, holder_name, initial_balance, interest_rate):
-        super().__init__(account_number, holder_name, initial_balance)
+    __slots__ = ("interest_rate",)
+
+    def __init__(self, account_number, holder_name, initial_balance, interest_rate, ledger=None, store=None):
+        super().__init__(account_number, holder_name, initial_balance, ledger, store)
         self.interest_rate = interest_rate  # Public
 
     def apply_interest(self):
-        interest = self.get_balance() * (self.interest_rate / 100)
-        print(f"Applying interest: ₹{interest}")
-        self.deposit(interest)
+        # Worked out in whole paise, exactly like BulkInterest below
+        interest = interest_paise(to_paise(self.get_balance()), rate_units(self.interest_rate)) / PAISE_PER_RUPEE
+        emit("interest", True, "Applying interest: ₹{amount}", account=self.account_number, amount=interest)
+        # Recorded as interest in the ledger, reported like a deposit
+        balance = self._deposit(interest, kind="interest")
+        if balance is not None:
+            return emit("deposit", True, "₹{amount} deposited. New balance: ₹{balance}",
+                        account=self.account_number, amount=interest, balance=balance)
+        return emit("deposit", False, "Invalid deposit amount.", account=self.account_number, amount=interest)
 
     def display_info(self):
         self._display_holder()  # Accessing protected method
@@ -43,15 +442,358 @@ class SavingsAccount(BankAccount):
         print(f"Interest Rate: {self.interest_rate}%")
 
 
+# --- Account Manager ---
+
+class AccountManager:
+    """
+    Looks after all the bank's accounts and runs deposits, withdrawals and
+    transfers on them safely from many threads at once.
+
+    Accounts share a fixed set of striped locks in their AccountStore, so
+    operations on different accounts only wait for each other when their
+    accounts happen to share a stripe. With a ledger, every operation also
+    holds the ledger's lock briefly while it records the change, so the
+    ledger order matches the order balances changed in (the slow part,
+    writing to disk, happens outside it).
+
+    The operations return the new balance (or True for transfers) when they
+    succeed, and None (or False) when they don't, instead of printing.
+    """
+    def __init__(self, ledger=None, store=None):
+        self.ledger = ledger
+        self.store = store if store is not None else AccountStore()
+        self.accounts = {}
+        self._open_lock = threading.Lock()
+
+    def open_account(self, account_number, holder_name, initial_balance=0, interest_rate=None):
+        with self._open_lock:
+            if account_number in self.accounts:
+                raise ValueError(f"Account {account_number} already exists")
+            if interest_rate is None:
+                account = BankAccount(account_number, holder_name, initial_balance, self.ledger, self.store)
+            else:
+                account = SavingsAccount(account_number, holder_name, initial_balance,
+                                         interest_rate, self.ledger, self.store)
+            self.accounts[account_number] = account
+        return account
+
+    def deposit(self, account_number, amount):
+        return self.accounts[account_number]._deposit(amount)
+
+    def withdraw(self, account_number, amount):
+        return self.accounts[account_number]._withdraw(amount)
+
+    def transfer(self, from_number, to_number, amount):
+        return self.accounts[from_number].transfer_to(self.accounts[to_number], amount)
+
+    def balance(self, account_number):
+        return self.accounts[account_number].get_balance()
+
+    def total_money(self):
+        return sum(account.get_balance() for account in self.accounts.values())
+
+
+def stress_test(threads=8, operations_per_thread=50000, account_counts=(2, 16, 256, 4096)):
+    """
+    Many threads move money around at once. Checks that no money appears
+    or disappears, that no account is overdrawn, and reports operations per
+    second for more and more independent accounts.
+    """
+    import random
+
+    print(f"📏 Stress test: {threads} threads x {operations_per_thread:,} operations")
+    all_ok = True
+    for accounts in account_counts:
+        bank = AccountManager()
+        numbers = [f"ACC{number:05d}" for number in range(accounts)]
+        for number in numbers:
+            bank.open_account(number, "Stress", 1000)
+        money_before = bank.total_money()
+        start_line = threading.Barrier(threads + 1)
+
+        def work(seed):
+            chooser = random.Random(seed)
+            start_line.wait()
+            for _ in range(operations_per_thread):
+                source, target = chooser.choice(numbers), chooser.choice(numbers)
+                amount = chooser.randint(1, 300)
+                if chooser.random() < 0.8:
+                    bank.transfer(source, target, amount)
+                elif bank.withdraw(source, amount) is not None:
+                    bank.deposit(target, amount)  # The cash goes straight back in
+
+        workers = [threading.Thread(target=work, args=(seed,)) for seed in range(threads)]
+        for worker in workers:
+            worker.start()
+        start_line.wait()
+        start = time.perf_counter()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+
+        conserved = bank.total_money() == money_before
+        overdrawn = sum(1 for number in numbers if bank.balance(number) < 0)
+        all_ok = all_ok and conserved and not overdrawn
+        print(f"  {accounts:>5} accounts: {threads * operations_per_thread / elapsed:10,.0f} ops/sec, "
+              f"money {'conserved' if conserved else 'NOT conserved'}, {overdrawn} overdrawn")
+
+    # Everyone withdraws from the same account at once: exactly its balance comes out
+    bank = AccountManager()
+    bank.open_account("SHARED", "Stress", 5000)
+    withdrawn = []
+
+    def drain():
+        while bank.withdraw("SHARED", 1) is not None:
+            withdrawn.append(1)
+
+    workers = [threading.Thread(target=drain) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    all_ok = all_ok and sum(withdrawn) == 5000 and bank.balance("SHARED") == 0
+    print(f"  racing withdrawals took out ₹{sum(withdrawn):,} of ₹5,000")
+    print("✅ Money conserved, no account overdrawn." if all_ok else "❌ The stress test found a problem!")
+    return all_ok
+
+
+# --- Bulk Interest ---
+
+AUDIT_DTYPE = [("account", "u4"), ("interest", "i8"), ("balance", "i8")] if np is not None else None
+
+
+class BulkInterest:
+    """
+    Month-end interest for many savings accounts at once.
+
+    Balances (in paise) and rates (in rate units) live in NumPy arrays, one
+    slot per account, and post_interest() pays everyone in one vectorized
+    pass. The result is the same, to the paisa, as calling apply_interest()
+    on every account.
+
+    Built with from_accounts(), the interest is really paid: it goes into the
+    accounts' AccountStore and, with a ledger, into the ledger as well.
+    """
+    def __init__(self, account_numbers, balances_paise, rates):
+        if np is None:
+            raise RuntimeError("Bulk interest needs NumPy: pip install numpy")
+        self.account_numbers = list(account_numbers)
+        self.balances = np.asarray(balances_paise, dtype=np.int64).copy()
+        self.rates = np.asarray(rates, dtype=np.int64).copy()
+        self.accounts = None
+
+    @classmethod
+    def from_accounts(cls, accounts):
+        """
+        Builds the arrays from SavingsAccount objects, which must share one
+        store and one ledger (or none). post_interest() then pays them.
+        """
+        accounts = list(accounts)
+        if accounts and any(account.store is not accounts[0].store or account.ledger is not accounts[0].ledger
+                            for account in accounts):
+            raise ValueError("Bulk interest needs accounts from one store and one ledger")
+        book = cls([account.account_number for account in accounts],
+                   [to_paise(account.get_balance()) for account in accounts],
+                   [rate_units(account.interest_rate) for account in accounts])
+        book.accounts = accounts
+        book._slots = np.array([account.slot for account in accounts], dtype=np.intp)
+        return book
+
+    def post_interest(self):
+        """
+        Pays interest to every account with a positive balance. Returns the
+        audit record: one row per account with its index, the interest paid
+        and the new balance, all in paise.
+        """
+        if self.accounts:
+            return self._post_to_accounts()
+        interest = self._interest_on(self.balances)
+        self.balances += interest
+        return self._audit(interest)
+
+    def _interest_on(self, balances):
+        whole, part = np.divmod(balances, _RATE_DIVISOR)
+        interest = whole * self.rates + (2 * part * self.rates + _RATE_DIVISOR) // (2 * _RATE_DIVISOR)
+        interest[interest < 0] = 0  # apply_interest never takes money away
+        return interest
+
+    def _audit(self, interest):
+        audit = np.empty(len(self.balances), dtype=AUDIT_DTYPE)
+        audit["account"] = np.arange(len(self.balances))
+        audit["interest"] = interest
+        audit["balance"] = self.balances
+        return audit
+
+    def _post_to_accounts(self):
+        # Works on a NumPy view of the store's balances column, with the whole
+        # store locked, so interest is paid on the balances as they are now
+        # and nothing else changes them halfway through
+        store, ledger = self.accounts[0].store, self.accounts[0].ledger
+        seq = None
+        with store.locked():
+            column = np.frombuffer(store.balances, dtype=np.int64)
+            self.balances = column[self._slots]
+            interest = self._interest_on(self.balances)
+            self.balances += interest
+            column[self._slots] = self.balances
+            del column  # The column can only grow again once the view is gone
+
+            if ledger is not None:
+                # Recorded exactly like apply_interest() records it
+                with ledger.lock:
+                    for index in np.flatnonzero(interest).tolist():
+                        seq = ledger.append(self.account_numbers[index], "interest",
+                                            int(interest[index]) / PAISE_PER_RUPEE,
+                                            to_rupees(int(self.balances[index])))
+        if seq is not None:
+            ledger.wait(seq)
+        return self._audit(interest)
+
+    def balance_of(self, index):
+        """The balance of one account in rupees."""
+        return int(self.balances[index]) / PAISE_PER_RUPEE
+
+
+def benchmark_interest(accounts=1000000, months=3, checked=20000):
+    """Month-end interest for many accounts, vectorized, checked against apply_interest()."""
+    import random
+
+    chooser = random.Random(7)
+    balances = [chooser.randrange(0, 10 ** 9) for _ in range(accounts)]  # up to ₹1 crore
+    rates = [chooser.choice((2.5, 3.0, 3.5, 4.0, 4.5, 6.25, 7.125)) for _ in range(accounts)]
+
+    book = BulkInterest(range(accounts), balances, [rate_units(rate) for rate in rates])
+    print(f"📏 Month-end interest for {accounts:,} accounts, {months} month(s)")
+    start = time.perf_counter()
+    for _ in range(months):
+        audit = book.post_interest()
+    elapsed = time.perf_counter() - start
+    print(f"  vectorized     {elapsed / months * 1000:9.1f} ms per month "
+          f"({accounts * months / elapsed:,.0f} accounts/sec), audit {audit.nbytes / accounts:.0f} bytes/account")
+
+    store = AccountStore()
+    savers = [SavingsAccount(number, "Saver", balances[number] / PAISE_PER_RUPEE, rates[number], store=store)
+              for number in range(checked)]
+    start = time.perf_counter()
+    with use_sink(SilentSink()):
+        for _ in range(months):
+            for saver in savers:
+                saver.apply_interest()
+    elapsed = time.perf_counter() - start
+    print(f"  apply_interest {elapsed / months / checked * accounts * 1000:9.1f} ms per month "
+          f"(estimated from {checked:,} accounts)")
+
+    mismatches = sum(1 for number, saver in enumerate(savers)
+                     if to_paise(saver.get_balance()) != int(book.balances[number]))
+    print("✅ Same balances as apply_interest()." if not mismatches
+          else f"❌ {mismatches} account(s) differ from apply_interest()!")
+
+
+# --- Ledger Checks ---
+
+def benchmark_ledger(transactions=100000, thread_counts=(1, 8, 32)):
+    """Transactions per second, durable on return (group commit) and batched."""
+    import tempfile
+
+    print(f"📏 Ledger throughput ({transactions:,} deposits per run)")
+    for sync in (True, False):
+        for threads in thread_counts if sync else (1,):
+            with tempfile.TemporaryDirectory() as folder:
+                ledger = Ledger(folder, sync=sync)
+                store = AccountStore()
+                accounts = [BankAccount(f"ACC{number}", "Bench", 0, ledger, store)
+                            for number in range(max(threads, 64))]
+                per_thread = transactions // threads
+
+                def work(first):
+                    for step in range(per_thread):
+                        accounts[(first + step) % len(accounts)].deposit(1)
+
+                workers = [threading.Thread(target=work, args=(number,)) for number in range(threads)]
+                start = time.perf_counter()
+                with use_sink(SilentSink()):
+                    for worker in workers:
+                        worker.start()
+                    for worker in workers:
+                        worker.join()
+                    ledger.flush()
+                elapsed = time.perf_counter() - start
+                ledger.close()
+
+                label = f"durable, {threads} thread(s)" if sync else "batched, 1 thread"
+                print(f"  {label:<24} {per_thread * threads / elapsed:10,.0f} transactions/sec")
+
+
+def _crash_child(folder):
+    # Deposits ₹1 at a time and reports each one once it's on disk, until killed
+    ledger = Ledger(folder)
+    account = BankAccount("CRASH", "Crash Test", 0, ledger)
+    while True:
+        with use_sink(SilentSink()):
+            account.deposit(1)
+        os.write(1, f"{account.get_balance()}\n".encode())
+        if account.get_balance() % 500 == 0:
+            ledger.checkpoint()
+
+
+def crash_test(confirmed_target=3000):
+    """
+    Kills a process in the middle of writing transactions, then checks that
+    every transaction it confirmed is still there after recovery.
+    """
+    import signal
+    import subprocess
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as folder:
+        child = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--crash-child", folder],
+                                 stdout=subprocess.PIPE)
+        confirmed = 0
+        for line in child.stdout:
+            confirmed = int(line)
+            if confirmed >= confirmed_target:
+                break
+        child.send_signal(signal.SIGKILL)
+        child.wait()
+
+        # A torn, half-written line like a crash mid-write would leave
+        segment = sorted(name for name in os.listdir(folder) if name.startswith(WAL_PREFIX))[-1]
+        with open(os.path.join(folder, segment), "ab") as file:
+            file.write(b'{"seq": 99999999, "account": "CRA')
+
+        ledger = Ledger(folder)
+        recovered = ledger.balances["CRASH"]
+        history = ledger.history("CRASH")
+        replayed = sum(record["amount"] for record in history)
+        ledger.close()
+
+    print(f"💥 Killed after {confirmed:,} confirmed deposits; recovered balance ₹{recovered:,}")
+    ok = recovered >= confirmed and replayed == recovered
+    print("✅ No confirmed transaction was lost." if ok else "❌ Recovery lost transactions!")
+    return ok
+
+
 # --- Usage Example ---
-acc = SavingsAccount("1234567890", "Amit Verma", 10000, 4.5)
-acc.display_info()
-acc.deposit(5000)
-acc.withdraw(3000)
-acc.apply_interest()
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark_ledger()
+    elif "--interest-benchmark" in sys.argv:
+        benchmark_interest()
+    elif "--stress-test" in sys.argv:
+        stress_test()
+    elif "--crash-test" in sys.argv:
+        crash_test()
+    elif "--crash-child" in sys.argv:
+        _crash_child(sys.argv[-1])
+    else:
+        acc = SavingsAccount("1234567890", "Amit Verma", 10000, 4.5)
+        acc.display_info()
+        acc.deposit(5000)
+        acc.withdraw(3000)
+        acc.apply_interest()
 
-# Trying to access private attribute directly (not recommended)
-# print(acc.__balance)  # Will raise an error
+        # Trying to access private attribute directly (not recommended)
+        # print(acc.__balance)  # Will raise an error
 
-# Accessing private variable using name mangling (not recommended)
-print("Accessing private balance using name mangling:", acc._BankAccount__balance)
+        # Accessing private variable using name mangling (not recommended)
+        print("Accessing private balance using name mangling:", acc._BankAccount__balance)
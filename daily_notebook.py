@@ -9,72 +9,708 @@ learning habit and look back on your progress over time.
 """
 
 import json      # To save and load your journal entries
+import math      # For the search ranking formula
 import os        # To check if your entries file exists
+import re        # To split notes into words for searching
+import sqlite3   # To store the search index
+import struct    # To pack the date index into fixed-size records
+import sys       # To spot the --benchmark option
+import threading # To let only one thread re-read the journal at a time
+from contextlib import closing, contextmanager  # To always close files and release locks
 from datetime import date  # To get today’s date
 
+try:
+    import fcntl  # To keep two programs from compacting the journal at once
+except ImportError:  # Not on Windows; there the journal is only safe for one program
+    fcntl = None
+
 # This is the file where we'll keep all your TIL notes
 FILENAME = "entries.json"
 
+# New notes are first appended to this JSON-lines log, one small line per
+# note, so adding a note never has to rewrite the whole journal. Every now
+# and then the log is folded back into entries.json ("compaction").
+LOG_FILENAME = "entries.log.jsonl"
+
+# Compaction first moves the log aside under this name, so notes added
+# while it runs start a fresh log. If it crashes halfway, the notes in here
+# are still read (and folded in by the next compaction).
+COMPACTING_FILENAME = "entries.log.compacting.jsonl"
+
+# Adding a note takes a shared lock on this file and compaction an
+# exclusive one, so a compaction never throws away a note that another
+# program is adding at that very moment.
+LOCK_FILENAME = "entries.lock"
+
+# Compact once the log is bigger than entries.json (but never for a log
+# smaller than this). Growing the threshold with the journal keeps the
+# average cost of adding a note constant.
+COMPACT_MIN_BYTES = 64 * 1024
+
+def _fsync_directory(path):
+    # Make sure a rename inside this folder survives a power cut too
+    # (not every system lets us open a folder, and that's fine)
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+@contextmanager
+def _journal_lock(exclusive=True):
+    # Hold the journal lock for the length of a with block
+    if fcntl is None:
+        yield
+        return
+    with open(LOCK_FILENAME, "a") as file:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+def _read_log():
+    # Replay the log line by line (a log left behind by a crashed compaction
+    # first); a half-written last line from a crash is simply skipped
+    records = []
+    for name in (COMPACTING_FILENAME, LOG_FILENAME):
+        if os.path.exists(name):
+            with open(name, "r") as file:
+                for line in file:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+    return records
+
+# The last journal we parsed, and the (mtime, size, inode) of entries.json
+# and the log at the time. While those haven't changed, load_entries()
+# answers from memory instead of parsing the files all over again.
+_cache = {"signature": None, "entries": {}}
+_reload_lock = threading.Lock()
+
+def _journal_signature():
+    signature = []
+    for name in (FILENAME, COMPACTING_FILENAME, LOG_FILENAME):
+        try:
+            info = os.stat(name)
+        except FileNotFoundError:
+            signature.append(None)
+        else:
+            signature.append((info.st_mtime_ns, info.st_size, info.st_ino))
+    return tuple(signature)
+
 def load_entries():
+    # Hand back the cached notes while the files are unchanged. Each caller
+    # gets its own copy, so changing it can't spoil the cache.
+    signature = _journal_signature()
+    if _cache["signature"] == signature:
+        return dict(_cache["entries"])
+
+    # Only one thread re-reads the files; the others wait and then use
+    # what it found
+    with _reload_lock:
+        signature = _journal_signature()
+        if _cache["signature"] != signature:
+            # Take the signature *before* reading, so a write that sneaks in
+            # while we read just makes the next call read again
+            entries = _read_entries()
+            _cache["entries"] = entries
+            _cache["signature"] = signature
+        return dict(_cache["entries"])
+
+def _read_entries():
     # If the file with your notes exists, open and read it
     if os.path.exists(FILENAME):
         with open(FILENAME, "r") as file:
-            return json.load(file)  # Load your saved notes as a dictionary
+            entries = json.load(file)  # Load your saved notes as a dictionary
     else:
         # If there’s no file yet, just start fresh with an empty dictionary
-        return {}
+        entries = {}
+
+    # Then add the notes that are still waiting in the log
+    for record in _read_log():
+        entries[record["date"]] = record["entry"]
+    return entries
 
 def save_entries(entries):
-    # Save your notes back to the file, nicely formatted
-    with open(FILENAME, "w") as file:
-        json.dump(entries, file, indent=4)
+    # Save your notes back to the file, nicely formatted (oldest first, one
+    # note per line, just like json.dump with indent=4 would). We write a
+    # temporary file first and swap it in, so a crash never leaves you
+    # with a half-written journal. Along the way we remember where each
+    # note starts, so the date index can jump straight to it later.
+    with _journal_lock():
+        _save_entries(entries)
+
+def _save_entries(entries):
+    # save_entries() without taking the lock (the caller holds it)
+    temp_name = f"{FILENAME}.{os.getpid()}.tmp"
+    records = []
+    with open(temp_name, "wb") as file:
+        if not entries:
+            file.write(b"{}")
+        else:
+            file.write(b"{\n")
+            days = sorted(entries)
+            for number, day in enumerate(days):
+                key = json.dumps(day).encode("ascii")
+                file.write(b"    " + key + b": ")
+                value = json.dumps(entries[day]).encode("ascii")
+                records.append((day, JOURNAL_NOTE, file.tell(), len(value), len(key)))
+                file.write(value)
+                file.write(b",\n" if number < len(days) - 1 else b"\n")
+            file.write(b"}")
+        file.flush()
+        os.fsync(file.fileno())
+        journal_size = file.tell()
+    os.replace(temp_name, FILENAME)
+    _fsync_directory(FILENAME)
+
+    # Everything from the log is now in entries.json, so start a new log
+    for name in (COMPACTING_FILENAME, LOG_FILENAME):
+        if os.path.exists(name):
+            os.remove(name)
+
+    _write_index(records, journal_size, 0)
+
+    # Keep the search index (if you've used search) in step with the journal
+    if os.path.exists(SEARCH_FILENAME):
+        _sync_search_index(entries)
+
+def compact_entries():
+    # Fold the log into entries.json. Only one compaction runs at a time,
+    # and no note is added while it does. The log is moved aside before it
+    # is read, so it's never read and deleted as the same growing file.
+    with _journal_lock():
+        if os.path.exists(LOG_FILENAME) and not os.path.exists(COMPACTING_FILENAME):
+            os.replace(LOG_FILENAME, COMPACTING_FILENAME)
+        _save_entries(_read_entries())
+
+def append_entry(day, entry):
+    # Add one note to the end of the log. This only touches the end of the
+    # file, so it costs the same no matter how big your journal gets.
+    line = (json.dumps({"date": day, "entry": entry}) + "\n").encode("utf-8")
+    with _journal_lock(exclusive=False), open(LOG_FILENAME, "a+b") as file:
+        old_log_size = file.tell()
+        # If a crash cut the last line short, start on a fresh line
+        if file.tell() > 0:
+            file.seek(-1, os.SEEK_END)
+            if file.read(1) != b"\n":
+                file.write(b"\n")
+        offset = file.tell()
+        file.write(line)
+        file.flush()
+        os.fsync(file.fileno())
+        log_size = file.tell()
+
+    if log_size > max(COMPACT_MIN_BYTES, _file_size(FILENAME)):
+        compact_entries()
+    else:
+        _index_note(day, offset, len(line), old_log_size, log_size)
+
+def _latest_record():
+    # Peek at the last note in the log without reading the rest of it
+    if not os.path.exists(LOG_FILENAME):
+        return None
+    with open(LOG_FILENAME, "rb") as file:
+        file.seek(0, os.SEEK_END)
+        position = file.tell()
+        tail = b""
+        while position > 0 and tail.count(b"\n") < 3:
+            step = min(4096, position)
+            position -= step
+            file.seek(position)
+            tail = file.read(step) + tail
+    for line in reversed(tail.splitlines()):
+        try:
+            return json.loads(line)
+        except ValueError:
+            continue
+    return None
+
+def find_entry(day):
+    # Notes are added day by day, so today's note (if any) is the last one
+    # in the log. Only right after a compaction do we look in entries.json.
+    record = _latest_record()
+    if record is not None:
+        return record["entry"] if record["date"] == day else None
+    return load_entries().get(day)
+
+# --- The date index ---
+# A small binary file beside entries.json that lists every note's date in
+# order, together with where that note lives on disk. Every record has the
+# same size, so we can binary-search it with a few seeks and read only the
+# records a query actually needs, instead of loading the whole journal.
+#
+# A date fits in the record itself. Any other key (save_entries() takes any
+# string) keeps its first bytes there, and the whole key is read from the
+# journal or log, where it sits right next to its note.
+INDEX_FILENAME = "entries.idx"
+INDEX_HEADER = struct.Struct("<4sQQ")     # magic, journal size, log size
+INDEX_RECORD = struct.Struct("<10sBQII")  # date, where, offset, length, key length
+INDEX_MAGIC = b"TIL2"
+INDEX_PAGE = 256  # How many index records we read from disk at a time
+INLINE_KEY_BYTES = 10
+
+# Where a note lives: a JSON string inside entries.json, or a whole line
+# in the log. LONG_KEY is added when the key didn't fit in the record.
+JOURNAL_NOTE = 0
+LOG_NOTE = 1
+LONG_KEY = 2
+LOG_KEY_OFFSET = len('{"date": ')  # Where the key starts in a log line
+
+def _pack_record(day, where, offset, length, key_length):
+    key = day.encode("utf-8")
+    if len(key) > INLINE_KEY_BYTES or b"\0" in key:
+        where |= LONG_KEY
+    return INDEX_RECORD.pack(key[:INLINE_KEY_BYTES], where, offset, length, key_length)
+
+def _read_long_key(where, offset, key_length):
+    # The whole key, from just before the note (entries.json: "key": note)
+    # or from the start of its log line
+    if where == LOG_NOTE:
+        name, key_offset = LOG_FILENAME, offset + LOG_KEY_OFFSET
+    else:
+        name, key_offset = FILENAME, offset - len(": ") - key_length
+    with open(name, "rb") as file:
+        file.seek(key_offset)
+        return json.loads(file.read(key_length))
+
+def _write_index(records, journal_size, log_size):
+    # Write the whole index at once (records must already be sorted by date)
+    temp_name = f"{INDEX_FILENAME}.{os.getpid()}.tmp"
+    try:
+        with open(temp_name, "wb") as file:
+            file.write(INDEX_HEADER.pack(INDEX_MAGIC, journal_size, log_size))
+            for record in records:
+                file.write(_pack_record(*record))
+        os.replace(temp_name, INDEX_FILENAME)
+    finally:
+        if os.path.exists(temp_name):
+            os.remove(temp_name)
+
+def _file_size(name):
+    return os.path.getsize(name) if os.path.exists(name) else 0
+
+def _index_is_fresh(file):
+    # The header remembers how big entries.json and the log were when the
+    # index was last updated. If they've changed behind our back, it's stale.
+    file.seek(0)
+    header = file.read(INDEX_HEADER.size)
+    if len(header) != INDEX_HEADER.size:
+        return False
+    magic, journal_size, log_size = INDEX_HEADER.unpack(header)
+    return (magic == INDEX_MAGIC and journal_size == _file_size(FILENAME)
+            and log_size == _file_size(LOG_FILENAME) and not os.path.exists(COMPACTING_FILENAME))
+
+def _index_note(day, offset, length, old_log_size, new_log_size):
+    # Add a freshly logged note to the end of the index. That only works if
+    # the index was up to date and the new note is the newest one; otherwise
+    # we leave the index stale and it gets rebuilt on the next query.
+    if not os.path.exists(INDEX_FILENAME):
+        return
+    with open(INDEX_FILENAME, "r+b") as file:
+        file.seek(0)
+        header = file.read(INDEX_HEADER.size)
+        if len(header) != INDEX_HEADER.size:
+            return
+        magic, journal_size, log_size = INDEX_HEADER.unpack(header)
+        if (magic != INDEX_MAGIC or journal_size != _file_size(FILENAME)
+                or log_size != old_log_size):
+            return
+        count = _record_count(file)
+        if count and _read_records(file, count - 1, 1)[0][0] >= day:
+            return
+        file.seek(0, os.SEEK_END)
+        file.write(_pack_record(day, LOG_NOTE, offset, length, len(json.dumps(day))))
+        file.flush()
+        # Update the header last: if we crash before this, the index just
+        # looks stale and gets rebuilt
+        file.seek(0)
+        file.write(INDEX_HEADER.pack(INDEX_MAGIC, journal_size, new_log_size))
+
+def _record_count(file):
+    file.seek(0, os.SEEK_END)
+    return (file.tell() - INDEX_HEADER.size) // INDEX_RECORD.size
+
+def _read_records(file, first, count):
+    # Read `count` index records starting at record number `first`
+    file.seek(INDEX_HEADER.size + first * INDEX_RECORD.size)
+    data = file.read(count * INDEX_RECORD.size)
+    records = []
+    for start in range(0, len(data), INDEX_RECORD.size):
+        key, where, offset, length, key_length = INDEX_RECORD.unpack_from(data, start)
+        if where & LONG_KEY:
+            where &= ~LONG_KEY
+            day = _read_long_key(where, offset, key_length)
+        else:
+            day = key.rstrip(b"\0").decode("utf-8")
+        records.append((day, where, offset, length))
+    return records
+
+def _first_record_at_or_after(file, count, day):
+    # Classic binary search, one seek per step
+    low, high = 0, count
+    while low < high:
+        middle = (low + high) // 2
+        if _read_records(file, middle, 1)[0][0] < day:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+def _open_index():
+    # Open the index, rebuilding it first if it's missing or stale
+    if os.path.exists(INDEX_FILENAME):
+        file = open(INDEX_FILENAME, "rb")
+        if _index_is_fresh(file):
+            return file
+        file.close()
+    compact_entries()  # Rewrites entries.json and builds a fresh index
+    return open(INDEX_FILENAME, "rb")
+
+def _read_note(files, where, offset, length):
+    # Jump straight to one note on disk and read just that note
+    file = files[where]
+    file.seek(offset)
+    text = json.loads(file.read(length))
+    return text["entry"] if where == LOG_NOTE else text
+
+def _walk_index(first=None, last=None, newest_first=False, limit=None):
+    # Lazily yields (date, note) for every date from `first` to `last`
+    # (both included), reading the index and the notes a page at a time
+    with _open_index() as index:
+        count = _record_count(index)
+        start = 0 if first is None else _first_record_at_or_after(index, count, first)
+        stop = count if last is None else _first_record_at_or_after(index, count, last + "\uffff")
+        if limit is not None:
+            if newest_first:
+                start = max(start, stop - limit)
+            else:
+                stop = min(stop, start + limit)
+
+        files = {JOURNAL_NOTE: None, LOG_NOTE: None}
+        try:
+            if os.path.exists(FILENAME):
+                files[JOURNAL_NOTE] = open(FILENAME, "rb")
+            if os.path.exists(LOG_FILENAME):
+                files[LOG_NOTE] = open(LOG_FILENAME, "rb")
+
+            if newest_first:
+                pages = range(stop, start, -INDEX_PAGE)
+            else:
+                pages = range(start, stop, INDEX_PAGE)
+            for page in pages:
+                if newest_first:
+                    page_start = max(start, page - INDEX_PAGE)
+                    records = _read_records(index, page_start, page - page_start)[::-1]
+                else:
+                    records = _read_records(index, page, min(INDEX_PAGE, stop - page))
+                for day, where, offset, length in records:
+                    yield day, _read_note(files, where, offset, length)
+        finally:
+            for file in files.values():
+                if file is not None:
+                    file.close()
+
+def latest_entries(count):
+    # Your `count` most recent notes, newest first
+    return _walk_index(newest_first=True, limit=count)
+
+def entries_between(first_day, last_day):
+    # Every note from first_day to last_day (both included, "YYYY-MM-DD"),
+    # oldest first
+    return _walk_index(first_day, last_day)
+
+def entries_for_month(year, month):
+    # Every note written in one month, oldest first
+    prefix = f"{year:04d}-{month:02d}"
+    return _walk_index(prefix + "-01", prefix + "-31")
+
+# --- Full-text search ---
+# An inverted index: for every word, which notes use it and at which
+# positions. It lives in a small SQLite file beside entries.json, so a
+# search only looks up the handful of words you typed instead of reading
+# every note you've ever written.
+SEARCH_FILENAME = "entries.search.db"
+SEARCH_RESULTS = 10  # How many notes a search shows by default
+
+# BM25 ranking knobs: how quickly repeated words stop counting extra, and
+# how much long notes are held back
+RANK_K1 = 1.2
+RANK_B = 0.75
+
+def _tokenize(text):
+    # Split a note into lowercase words
+    return re.findall(r"\w+", text.lower())
+
+def _connect_search():
+    connection = sqlite3.connect(SEARCH_FILENAME)
+    connection.executescript("""
+        CREATE TABLE IF NOT EXISTS notes (
+            day TEXT PRIMARY KEY, entry TEXT NOT NULL, length INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS postings (
+            token TEXT NOT NULL, day TEXT NOT NULL, positions TEXT NOT NULL,
+            length INTEGER NOT NULL, PRIMARY KEY (token, day)) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS totals (
+            name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+    """)
+    return connection
+
+def _add_to_totals(connection, notes, words):
+    # Keep running totals so ranking never has to count every note
+    for name, change in (("notes", notes), ("words", words)):
+        connection.execute(
+            "INSERT INTO totals VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, change))
+
+def _forget_note(connection, day):
+    row = connection.execute("SELECT entry, length FROM notes WHERE day = ?", (day,)).fetchone()
+    if row is None:
+        return
+    connection.executemany("DELETE FROM postings WHERE token = ? AND day = ?",
+                           [(token, day) for token in set(_tokenize(row[0]))])
+    connection.execute("DELETE FROM notes WHERE day = ?", (day,))
+    _add_to_totals(connection, -1, -row[1])
+
+def _remember_note(connection, day, entry):
+    # Replace whatever we knew about this day with the words of this note
+    _forget_note(connection, day)
+    tokens = _tokenize(entry)
+    positions = {}
+    for position, token in enumerate(tokens):
+        positions.setdefault(token, []).append(position)
+    connection.execute("INSERT INTO notes VALUES (?, ?, ?)", (day, entry, len(tokens)))
+    connection.executemany("INSERT INTO postings VALUES (?, ?, ?, ?)",
+                           [(token, day, json.dumps(spots), len(tokens))
+                            for token, spots in positions.items()])
+    _add_to_totals(connection, 1, len(tokens))
+
+def index_note(day, entry):
+    # Add one note to the search index (called every time a note is added,
+    # after it's saved). With no index yet, build it from the whole journal
+    # instead, or the older notes would never be found.
+    if not os.path.exists(SEARCH_FILENAME):
+        rebuild_search_index()
+        return
+    with closing(_connect_search()) as connection, connection:
+        _remember_note(connection, day, entry)
+
+def _sync_search_index(entries):
+    # Bring an existing search index in line with `entries`, touching only
+    # the notes that were added, changed or removed
+    with closing(_connect_search()) as connection, connection:
+        known = dict(connection.execute("SELECT day, entry FROM notes"))
+        for day in known.keys() - entries.keys():
+            _forget_note(connection, day)
+        for day, entry in entries.items():
+            if known.get(day) != entry:
+                _remember_note(connection, day, entry)
+
+def rebuild_search_index():
+    # Build the search index from scratch out of the whole journal
+    if os.path.exists(SEARCH_FILENAME):
+        os.remove(SEARCH_FILENAME)
+    _sync_search_index(load_entries())
+
+def _parse_query(query):
+    # "quoted words" are phrases, word* is a prefix, everything else is a word
+    terms = []
+    for phrase, word in re.findall(r'"([^"]*)"|(\S+)', query):
+        if phrase:
+            tokens = _tokenize(phrase)
+            if tokens:
+                terms.append(("phrase", tokens))
+        elif word.endswith("*") and _tokenize(word):
+            terms.append(("prefix", _tokenize(word)[0]))
+        else:
+            terms.extend(("word", token) for token in _tokenize(word))
+    return terms
+
+def _postings(connection, token, prefix=False, lengths=None):
+    # {day: [positions]} for one word, or for every word starting with it.
+    # Each note's word count is saved into `lengths` along the way.
+    if prefix:
+        rows = connection.execute(
+            "SELECT day, positions, length FROM postings WHERE token >= ? AND token < ?",
+            (token, token + "\U0010ffff"))
+    else:
+        rows = connection.execute(
+            "SELECT day, positions, length FROM postings WHERE token = ?", (token,))
+    found = {}
+    for day, positions, length in rows:
+        found.setdefault(day, []).extend(json.loads(positions))
+        if lengths is not None:
+            lengths[day] = length
+    return found
+
+def _phrase_postings(connection, tokens, lengths=None):
+    # {day: [start positions]} for the days where the words appear in a row
+    first_word = _postings(connection, tokens[0], lengths=lengths)
+    found = {day: set(spots) for day, spots in first_word.items()}
+    for step, token in enumerate(tokens[1:], start=1):
+        next_words = _postings(connection, token)
+        found = {day: {spot for spot in starts if spot + step in next_words[day]}
+                 for day, starts in found.items() if day in next_words}
+        found = {day: starts for day, starts in found.items() if starts}
+    return {day: sorted(starts) for day, starts in found.items()}
+
+def search_entries(query, limit=SEARCH_RESULTS):
+    # Find the notes that match every part of the query, best matches first.
+    # Returns a list of (day, note, score).
+    terms = _parse_query(query)
+    if not terms:
+        return []
+    if not os.path.exists(SEARCH_FILENAME):
+        rebuild_search_index()
+
+    with closing(_connect_search()) as connection:
+        totals = dict(connection.execute("SELECT name, value FROM totals"))
+        note_count = totals.get("notes", 0)
+        if not note_count:
+            return []
+        average_length = totals.get("words", 0) / note_count
+
+        matches = []
+        lengths = {}
+        for kind, value in terms:
+            if kind == "phrase":
+                matches.append(_phrase_postings(connection, value, lengths))
+            else:
+                matches.append(_postings(connection, value, kind == "prefix", lengths))
+            if not matches[-1]:
+                return []
+
+        # Only notes that match every term count
+        days = set(matches[0]).intersection(*matches[1:])
+        scores = {day: 0.0 for day in days}
+        for found in matches:
+            rarity = math.log(1 + (note_count - len(found) + 0.5) / (len(found) + 0.5))
+            for day in days:
+                hits = len(found[day])
+                stretch = RANK_K1 * (1 - RANK_B + RANK_B * lengths[day] / max(average_length, 1))
+                scores[day] += rarity * hits * (RANK_K1 + 1) / (hits + stretch)
+
+        # Only the notes we actually show are read back
+        ranked = sorted(days, key=lambda day: (-scores[day], day))[:limit]
+        return [(day, connection.execute("SELECT entry FROM notes WHERE day = ?",
+                                         (day,)).fetchone()[0], scores[day])
+                for day in ranked]
+
+def benchmark_search(sizes=(1000, 10000, 50000), queries=200):
+    # Compares search_entries() with scanning every note from load_entries(),
+    # for journals of growing size. Runs in a throwaway folder.
+    import random
+    import tempfile
+    import time
+
+    here = os.getcwd()
+    print("Notes     index search   linear scan   (average per query)")
+    try:
+        for size in sizes:
+            with tempfile.TemporaryDirectory() as folder:
+                os.chdir(folder)
+                chooser = random.Random(size)
+                # The vocabulary grows with the journal, so any one word turns
+                # up in about the same number of notes at every size
+                words = [f"word{number}" for number in range(size // 2)]
+                journal = {}
+                first_day = date(1900, 1, 1).toordinal()
+                for number in range(size):
+                    day = str(date.fromordinal(first_day + number))
+                    journal[day] = " ".join(chooser.choice(words) for _ in range(12))
+                save_entries(journal)
+                rebuild_search_index()
+                wanted = [chooser.choice(words) for _ in range(queries)]
+
+                start = time.perf_counter()
+                for word in wanted:
+                    search_entries(word)
+                indexed = (time.perf_counter() - start) / queries
+
+                start = time.perf_counter()
+                for word in wanted[:max(1, queries // 20)]:
+                    [day for day, entry in load_entries().items() if word in _tokenize(entry)]
+                scanned = (time.perf_counter() - start) / max(1, queries // 20)
+
+                os.chdir(here)
+            print(f"{size:<9} {indexed * 1000:9.2f} ms {scanned * 1000:11.2f} ms")
+    finally:
+        os.chdir(here)
 
 def add_entry():
     today = str(date.today())  # Get today’s date as a string, like "2025-08-29"
-    entries = load_entries()   # Load existing notes
+    existing = find_entry(today)  # Look for a note you already wrote today
 
     # Check if you’ve already written something today
-    if today in entries:
+    if existing is not None:
         print(f"\nLooks like you've already added something for today ({today}):")
-        print(f"\"{entries[today]}\"")
+        print(f"\"{existing}\"")
         return  # Don’t add a second note for the same day
 
     print("\nWhat did you learn today?")
     entry = input(">>> ").strip()  # Get your input and clean up spaces
 
     if entry:
-        entries[today] = entry  # Save your note for today
-        save_entries(entries)   # Write it to the file
+        append_entry(today, entry)  # Save your note for today
+        index_note(today, entry)    # And make it searchable
         print(f"\nAwesome! Your entry for {today} has been saved ✅")
     else:
         print("Oops! You didn’t write anything, so nothing was saved.")
 
 def view_entries():
-    entries = load_entries()  # Grab all your saved notes
+    # Walk the date index newest first, reading notes only as we print them
+    notes = latest_entries(None)
+    newest = next(notes, None)
 
-    if not entries:
+    if newest is None:
         print("\nYou haven’t written anything yet. Why not add your first TIL?")
         return
 
     print("\nHere’s everything you’ve learned so far:")
-    # Show the newest notes first
-    for day in sorted(entries.keys(), reverse=True):
-        print(f"{day}: {entries[day]}")
+    print(f"{newest[0]}: {newest[1]}")
+    for day, entry in notes:
+        print(f"{day}: {entry}")
+
+def search_notes():
+    print("\nWhat are you looking for? Use \"quotes\" for a phrase and word* for a prefix.")
+    query = input(">>> ").strip()
+    results = search_entries(query)
+
+    if not results:
+        print("\nNo notes match that search.")
+        return
+
+    print(f"\nBest matches for {query}:")
+    for day, entry, _ in results:
+        print(f"{day}: {entry}")
 
 def main():
     print("\n👋 Welcome to your Today I Learned Journal!")
     print("What would you like to do?")
     print("1. Add a new entry")
     print("2. See all your entries")
+    print("3. Search your entries")
 
-    choice = input("\nType 1 or 2: ").strip()
+    choice = input("\nType 1, 2 or 3: ").strip()
 
     if choice == "1":
         add_entry()
     elif choice == "2":
         view_entries()
+    elif choice == "3":
+        search_notes()
     else:
         print("Hmm, that’s not a valid choice. Please try again!")
 
 if __name__ == "__main__":
-    main()
+    if "--benchmark" in sys.argv:
+        benchmark_search()
+    else:
+        main()
@@ -1,11 +1,254 @@
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+try:
+    import numpy as np
+except ImportError:  # Only converting many readings at once needs NumPy
+    np = None
+
+UNITS = ("C", "F", "K")
+CHUNK_READINGS = 1 << 20     # Readings converted at a time (8 MB of float64)
+CSV_CHUNK_ROWS = 100000      # CSV rows read at a time
 
 def celsius_to_fahrenheit(celsius):
     return (celsius * 9/5) + 32
 
+def fahrenheit_to_celsius(fahrenheit):
+    return (fahrenheit - 32) * 5/9
+
+def celsius_to_kelvin(celsius):
+    return celsius + 273.15
+
+def kelvin_to_celsius(kelvin):
+    return kelvin - 273.15
+
+
+# Every conversion as a list of steps. The scalar functions above and the
+# array engine below do exactly these operations in exactly this order, so
+# they give exactly the same float64 results. F <-> K goes through Celsius.
+_STEPS = {
+    ("C", "F"): [("multiply", 9), ("divide", 5), ("add", 32)],
+    ("F", "C"): [("subtract", 32), ("multiply", 5), ("divide", 9)],
+    ("C", "K"): [("add", 273.15)],
+    ("K", "C"): [("subtract", 273.15)],
+}
+_STEPS[("F", "K")] = _STEPS[("F", "C")] + _STEPS[("C", "K")]
+_STEPS[("K", "F")] = _STEPS[("K", "C")] + _STEPS[("C", "F")]
+
+_SCALAR_OPS = {"multiply": lambda a, b: a * b, "divide": lambda a, b: a / b,
+               "add": lambda a, b: a + b, "subtract": lambda a, b: a - b}
+
+
+def _steps(from_unit, to_unit):
+    from_unit, to_unit = from_unit.upper(), to_unit.upper()
+    if from_unit not in UNITS or to_unit not in UNITS:
+        raise ValueError(f"Units must be one of {', '.join(UNITS)}")
+    return _STEPS.get((from_unit, to_unit), [])
+
+
+def convert_reading(value, from_unit, to_unit):
+    """Converts one temperature, e.g. convert_reading(100, "C", "F") -> 212.0."""
+    value = float(value)
+    for op, constant in _steps(from_unit, to_unit):
+        value = _SCALAR_OPS[op](value, constant)
+    return value
+
+
+def convert(readings, from_unit, to_unit, out=None, chunk=CHUNK_READINGS):
+    """
+    Converts a whole array of temperatures. Pass out=readings to convert in
+    place (e.g. a memory-mapped file). Works through `chunk` readings at a
+    time, so no temporary array is bigger than one chunk.
+
+    float64 results are identical to convert_reading(); other float types are
+    worked out in float64 and rounded once when stored. `out` must hold
+    floats: whole-number arrays would silently chop off the decimals.
+    """
+    if np is None:
+        raise RuntimeError("Converting arrays needs NumPy: pip install numpy")
+    steps = [(getattr(np, op), constant) for op, constant in _steps(from_unit, to_unit)]
+    readings = np.asarray(readings)
+    if out is None:
+        out = np.empty(readings.shape, dtype=np.float64)
+    elif not np.issubdtype(out.dtype, np.floating):
+        raise ValueError(f"out must hold floats, not {out.dtype}")
+    elif not out.flags.c_contiguous:
+        raise ValueError("out must be a contiguous array")
+    source, target = readings.reshape(-1), out.reshape(-1)  # Views, not copies
+
+    direct = target.dtype == np.float64
+    scratch = None if direct else np.empty(min(chunk, source.size), dtype=np.float64)
+    for start in range(0, source.size, chunk):
+        stop = min(start + chunk, source.size)
+        work = target[start:stop] if direct else scratch[:stop - start]
+        work[...] = source[start:stop]
+        for ufunc, constant in steps:
+            ufunc(work, constant, out=work)
+        if not direct:
+            target[start:stop] = work
+    return out
+
+
+def _convert_range(job):
+    # One worker's share of a file: converts readings [start, stop) in place
+    path, dtype, offset, start, stop, from_unit, to_unit = job
+    readings = np.memmap(path, dtype=dtype, mode="r+", offset=offset + start * np.dtype(dtype).itemsize,
+                         shape=(stop - start,))
+    convert(readings, from_unit, to_unit, out=readings)
+    readings.flush()
+    del readings
+    return stop - start
+
+
+def convert_file(path, from_unit, to_unit, dtype="float64", workers=1, chunk=CHUNK_READINGS):
+    """
+    Converts a binary file of readings in place, through a memory map, so a
+    multi-GB file never has to fit in memory. .npy files are understood;
+    anything else is read as raw `dtype` values, which must be a float type
+    (converted temperatures don't fit in whole numbers). With workers > 1
+    the file is split into ranges that a pool of processes converts at the
+    same time. Returns the number of readings converted.
+    """
+    if np is None:
+        raise RuntimeError("Converting files needs NumPy: pip install numpy")
+    offset = 0
+    if path.endswith(".npy"):
+        header = np.load(path, mmap_mode="r")
+        dtype, count = header.dtype, header.size
+        offset = header.offset
+        del header
+    else:
+        count = os.path.getsize(path) // np.dtype(dtype).itemsize
+    if not np.issubdtype(dtype, np.floating):
+        raise ValueError(f"Readings must be stored as floats to be converted in place, not {np.dtype(dtype)}")
+
+    workers = max(1, workers)
+    share = -(-count // workers)  # Round up
+    share = -(-share // chunk) * chunk if share > chunk else share
+    jobs = [(path, dtype, offset, start, min(start + share, count), from_unit, to_unit)
+            for start in range(0, count, share or 1)]
+    if workers == 1 or len(jobs) == 1:
+        return sum(map(_convert_range, jobs))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(_convert_range, jobs))
+
+
+def convert_csv(source, target, from_unit, to_unit, column=0, header=False, chunk_rows=CSV_CHUNK_ROWS):
+    """
+    Streams a CSV file from `source` to `target` (open text files),
+    converting the temperatures in `column` (a number, or a name when the
+    file has a header) and copying every other column as it is. Only
+    `chunk_rows` rows are held in memory at a time. Returns the row count.
+    """
+    reader, writer = csv.reader(source), csv.writer(target)
+    if header:
+        names = next(reader)
+        writer.writerow(names)
+        if not isinstance(column, int):
+            column = names.index(column)
+
+    rows_done = 0
+    while True:
+        rows = [row for _, row in zip(range(chunk_rows), reader)]
+        if not rows:
+            return rows_done
+        values = np.array([row[column] for row in rows], dtype=np.float64)
+        # tolist() gives plain Python floats, which print just like the scalar results
+        for row, value in zip(rows, convert(values, from_unit, to_unit, out=values).tolist()):
+            row[column] = repr(value)
+        writer.writerows(rows)
+        rows_done += len(rows)
+
+
+def benchmark_converter(readings=50000000, workers=None):
+    """Readings per second: in memory, in a memory-mapped file, and through CSV."""
+    import random
+    import tempfile
+
+    workers = workers or os.cpu_count() or 1
+    chooser = random.Random(11)
+    sample = [chooser.uniform(-80, 60) for _ in range(100000)]
+    array = np.random.default_rng(11).uniform(-80, 60, readings)
+
+    identical = convert(np.array(sample), "C", "F").tolist() == [celsius_to_fahrenheit(c) for c in sample]
+    identical &= all(convert(np.array(sample), a, b).tolist() == [convert_reading(c, a, b) for c in sample]
+                     for a in UNITS for b in UNITS)
+    print(f"📏 {readings:,} readings ({array.nbytes / 1e6:,.0f} MB)")
+    print("✅ Identical to the scalar functions." if identical else "❌ Results differ from the scalar functions!")
+
+    start = time.perf_counter()
+    for celsius in sample:
+        celsius_to_fahrenheit(celsius)
+    print(f"  scalar loop          {len(sample) / (time.perf_counter() - start):14,.0f} readings/sec")
+
+    start = time.perf_counter()
+    convert(array, "C", "F", out=array)
+    print(f"  array, in place      {readings / (time.perf_counter() - start):14,.0f} readings/sec")
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "readings.f64")
+        array.tofile(path)
+        for count in sorted({1, max(2, workers)}):
+            start = time.perf_counter()
+            convert_file(path, "F", "K", workers=count)
+            print(f"  file, {count:>2} process(es) {readings / (time.perf_counter() - start):14,.0f} readings/sec")
+
+        csv_rows = min(readings, 2000000)
+        source_path, target_path = os.path.join(folder, "in.csv"), os.path.join(folder, "out.csv")
+        with open(source_path, "w", newline="") as file:
+            file.write("sensor,celsius\n")
+            file.writelines(f"{number % 64},{value!r}\n" for number, value in enumerate(array[:csv_rows].tolist()))
+        start = time.perf_counter()
+        with open(source_path, newline="") as source, open(target_path, "w", newline="") as target:
+            convert_csv(source, target, "C", "F", column="celsius", header=True)
+        print(f"  CSV stream           {csv_rows / (time.perf_counter() - start):14,.0f} readings/sec")
+
+
+def main(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="🌡️ Temperature converter for big batches of readings")
+    parser.add_argument("source", nargs="?", help="a .npy, raw binary or .csv file ('-' for CSV on stdin)")
+    parser.add_argument("--from", dest="from_unit", choices=UNITS, default="C")
+    parser.add_argument("--to", dest="to_unit", choices=UNITS, default="F")
+    parser.add_argument("--dtype", default="float64", help="value type of raw binary files (default: float64)")
+    parser.add_argument("--workers", type=int, default=1, help="processes for binary files (default: 1)")
+    parser.add_argument("--column", default="0", help="CSV column: a number, or a name with --header")
+    parser.add_argument("--header", action="store_true", help="the CSV starts with a header row")
+    parser.add_argument("--output", default="-", help="where converted CSV goes (default: stdout)")
+    parser.add_argument("--benchmark", action="store_true", help="measure readings per second")
+    args = parser.parse_args(argv)
+    if args.source is None and not args.benchmark:
+        parser.error("a source file is needed (or --benchmark)")
+
+    if args.benchmark:
+        benchmark_converter()
+    elif args.source == "-" or args.source.endswith(".csv"):
+        column = int(args.column) if args.column.isdigit() else args.column
+        source = nullcontext(sys.stdin) if args.source == "-" else open(args.source, newline="")
+        target = nullcontext(sys.stdout) if args.output == "-" else open(args.output, "w", newline="")
+        with source as source, target as target:
+            rows = convert_csv(source, target, args.from_unit, args.to_unit, column, args.header)
+        print(f"Converted {rows:,} readings.", file=sys.stderr)
+    else:
+        try:
+            count = convert_file(args.source, args.from_unit, args.to_unit, args.dtype, args.workers)
+        except ValueError as error:
+            parser.error(str(error))
+        print(f"Converted {count:,} readings in place.")
+
+
 if __name__ == "__main__":
-    try:
-        a = float(input("Enter the Temperature in Degree Celsius: "))
-        fahrenheit = celsius_to_fahrenheit(a)
-        print(f"Temperature in Fahrenheit: {fahrenheit}")
-    except ValueError:
-        print("Please enter a valid number.")
+    if len(sys.argv) > 1:
+        main(sys.argv[1:])
+    else:
+        try:
+            a = float(input("Enter the Temperature in Degree Celsius: "))
+            fahrenheit = celsius_to_fahrenheit(a)
+            print(f"Temperature in Fahrenheit: {fahrenheit}")
+        except ValueError:
+            print("Please enter a valid number.")
@@ -4,6 +4,22 @@
 # - Flexible semesters (ask at end)
 # - Full report with SGPA & CGPA
 # By Shubham
+#
+# 🏫 Batch mode for whole cohorts (needs NumPy):
+#   python grade.py --batch cohort.csv [report.csv] [--semesters N] [--what-if]
+# 📜 Streaming report, one student at a time (no NumPy needed):
+#   python grade.py --report cohort.csv [report.txt] [--format text|csv|json]
+# cohort.csv has one row per grade: student,semester,subject,grade
+
+import argparse
+import csv
+import json
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # Only the batch mode needs NumPy
+    np = None
 
 # Grade to Grade Point Mapping
 GRADE_TO_GP = {
@@ -31,133 +47,533 @@ GRADE_MEANING = {
     'E': 'Fail'
 }
 
-# 🚀 Start of Program
-print("=" * 85)
-print("📊 CGPA CALCULATOR – GRADE INPUT MODE")
-print("📌 Enter grades directly (e.g., O, A1, B2). No marks needed!")
-print("=" * 85)
-
-# Step 1: Enter subjects (minimum 4)
-subjects = []
-print("\n📋 Enter subject names (minimum 4). Type 'done' to stop after 4.\n")
-
-while len(subjects) < 4:
-    sub = input(f"Subject {len(subjects) + 1}: ").strip()
-    if sub.lower() == 'done' and len(subjects) >= 4:
-        break
-    if sub == "" or sub.lower() == 'done':
-        print("⚠️  At least 4 subjects required.")
-        continue
-    subjects.append(sub)
-
-# Add more subjects
-while True:
-    more = input("\n➕ Add another subject? (yes/no): ").strip().lower()
-    if more in ['yes', 'y']:
-        new_sub = input("Subject name: ").strip()
-        if new_sub:
-            subjects.append(new_sub)
+PERCENTAGE_FACTOR = 9.5  # CBSE-style approximation
+
+
+# 🧮 The math behind the report
+def semester_sgpa(sem_data, subject_count):
+    """SGPA of one semester: total grade points / number of subjects."""
+    total_gp = sum(data[1] for data in sem_data)
+    return total_gp / subject_count
+
+
+def final_cgpa(sgpas):
+    """CGPA (average of the SGPAs) and the approximate percentage."""
+    # A plain running total, added left to right like PrefixCGPA does, so
+    # both give the very same CGPA (sum() rounds differently since 3.12)
+    total = 0.0
+    for sgpa in sgpas:
+        total += sgpa
+    cgpa = total / len(sgpas)
+    return cgpa, cgpa * PERCENTAGE_FACTOR
+
+
+# 🏫 Batch mode: a whole cohort at once
+def read_cohort_csv(path):
+    """
+    Reads a cohort CSV (student, semester, subject, grade) into columns.
+    A header row is skipped if the semester column isn't a number.
+    """
+    students, semesters, grades = [], [], []
+    with open(path, newline="") as file:
+        for line_no, row in enumerate(csv.reader(file), start=1):
+            if not row:
+                continue
+            if len(row) != 4:
+                raise ValueError(f"Line {line_no}: expected student,semester,subject,grade")
+            student, semester, _, grade = row
+            try:
+                semester = int(semester)
+            except ValueError:
+                if line_no == 1:
+                    continue  # Header row
+                raise ValueError(f"Line {line_no}: semester must be a number, got {semester!r}")
+            students.append(student.strip())
+            semesters.append(semester)
+            grades.append(grade.strip().upper())
+    return students, semesters, grades
+
+
+def grade_cohort(students, semesters, grades, n=None):
+    """
+    Computes every student's SGPAs, CGPA and percentage in one go.
+
+    The three lists hold one entry per grade row. Semesters are numbered
+    from 1, and each student's semesters must run 1, 2, 3... without gaps.
+    `n` limits the CGPA to semesters 1..n (students with fewer semesters
+    use all they have). The numbers are the same ones the interactive
+    report would print for each student.
+
+    Returns a dict with:
+      students   – student IDs, sorted
+      sgpa       – (students x semesters) array, NaN where there's no semester
+      semesters  – how many semesters went into each CGPA
+      cgpa, percentage
+    """
+    if np is None:
+        raise RuntimeError("Batch mode needs NumPy: pip install numpy")
+    if not students:
+        raise ValueError("The cohort has no grades.")
+
+    # Map grade codes to grade points: look up each distinct code once
+    codes, code_index = np.unique(np.asarray(grades, dtype=str), return_inverse=True)
+    unknown = [code for code in codes.tolist() if code not in GRADE_TO_GP]
+    if unknown:
+        raise ValueError(f"Invalid grade(s) {unknown}. Valid grades: {list(GRADE_TO_GP.keys())}")
+    grade_points = np.array([GRADE_TO_GP[code] for code in codes], dtype=np.int64)[code_index]
+
+    student_ids, student_index = np.unique(np.asarray(students, dtype=str), return_inverse=True)
+    semester_index = np.asarray(semesters, dtype=np.int64) - 1
+    if semester_index.min() < 0:
+        raise ValueError("Semesters are numbered from 1.")
+    max_semesters = int(semester_index.max()) + 1
+
+    # Total grade points and subject count of every (student, semester) cell
+    cell = student_index * max_semesters + semester_index
+    cells = len(student_ids) * max_semesters
+    totals = np.bincount(cell, weights=grade_points, minlength=cells).reshape(-1, max_semesters)
+    subjects = np.bincount(cell, minlength=cells).reshape(-1, max_semesters)
+
+    # Without gaps, the semesters taken are exactly the first `completed` ones
+    taken = subjects > 0
+    completed = taken.sum(axis=1)
+    gaps = completed != taken.cumprod(axis=1).sum(axis=1)
+    if gaps.any():
+        raise ValueError(f"Semesters must run 1, 2, 3... without gaps for: "
+                         f"{student_ids[gaps][:10].tolist()}")
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sgpa = np.where(taken, totals / subjects, np.nan)
+
+    prefix_cgpa = PrefixCGPA(student_ids, sgpa)
+    used = completed if n is None else np.minimum(completed, n)
+    cgpa = prefix_cgpa.cgpa_all(n)
+
+    return {
+        "students": student_ids,
+        "sgpa": sgpa,
+        "semesters": used,
+        "cgpa": cgpa,
+        "percentage": cgpa * PERCENTAGE_FACTOR,
+        "prefix_cgpa": prefix_cgpa,
+    }
+
+
+class PrefixCGPA:
+    """
+    Running SGPA totals for every student, for quick "what if" questions.
+
+    prefix[row, k] holds SGPA 1 + SGPA 2 + ... + SGPA k of one student, added
+    one at a time left to right like final_cgpa() does, so the CGPA over
+    semesters 1..k is a single lookup, prefix[row, k] / k, and matches the
+    interactive report.
+    Adding a new semester only extends one running total.
+    """
+
+    def __init__(self, students=(), sgpa=None):
+        # sgpa is a (students x semesters) array with NaN after each
+        # student's last semester, like grade_cohort() returns
+        self.students = [str(student) for student in students]
+        self._rows = {student: row for row, student in enumerate(self.students)}
+        if sgpa is None:
+            sgpa = np.empty((len(self.students), 0))
+        sgpa = np.asarray(sgpa, dtype=np.float64)
+
+        taken = ~np.isnan(sgpa)
+        self.completed = taken.sum(axis=1).astype(np.int64)
+        self.prefix = np.zeros((len(self.students), sgpa.shape[1] + 1))
+        np.cumsum(np.where(taken, sgpa, 0.0), axis=1, out=self.prefix[:, 1:])
+
+    def cgpa(self, student, k=None):
+        """CGPA of one student over semesters 1..k (default: all of them)."""
+        row = self._rows[student]
+        completed = int(self.completed[row])
+        k = completed if k is None else k
+        if not 1 <= k <= completed:
+            raise ValueError(f"{student!r} has {completed} semester(s), can't include 1 to {k}.")
+        return self.prefix[row, k] / k
+
+    def cgpa_all(self, k=None):
+        """
+        Every student's CGPA over semesters 1..k in one go (students with
+        fewer semesters use all they have). NaN for students with none.
+        """
+        count = len(self.students)
+        used = self.completed[:count] if k is None else np.minimum(self.completed[:count], k)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.prefix[np.arange(count), used] / used
+
+    def add_semester(self, student, sgpa):
+        """Appends the next semester's SGPA for a student (new students welcome)."""
+        student = str(student)
+        row = self._rows.get(student)
+        if row is None:
+            row = len(self.students)
+            self._grow(rows=row + 1)
+            self.students.append(student)
+            self._rows[student] = row
+            self.completed[row] = 0
+
+        completed = int(self.completed[row])
+        self._grow(columns=completed + 2)
+        self.prefix[row, completed + 1] = self.prefix[row, completed] + sgpa
+        self.completed[row] = completed + 1
+
+    def add_semesters(self, students, sgpas):
+        """Appends one new semester for many students."""
+        for student, sgpa in zip(students, sgpas):
+            self.add_semester(student, sgpa)
+
+    def _grow(self, rows=0, columns=0):
+        # Double the storage when we run out, so adding stays cheap on average
+        have_rows, have_columns = self.prefix.shape
+        if rows <= have_rows and columns <= have_columns:
+            return
+        new_rows = max(rows, 2 * have_rows) if rows > have_rows else have_rows
+        new_columns = max(columns, 2 * have_columns) if columns > have_columns else have_columns
+        prefix = np.zeros((new_rows, new_columns))
+        prefix[:have_rows, :have_columns] = self.prefix
+        completed = np.zeros(new_rows, dtype=np.int64)
+        completed[:have_rows] = self.completed
+        self.prefix, self.completed = prefix, completed
+
+
+def write_cohort_report(result, path, what_if=False):
+    """
+    Writes one CSV row per student: SGPAs, CGPA and percentage. With
+    what_if, also the CGPA over semesters 1..k for every k.
+    """
+    max_semesters = result["sgpa"].shape[1]
+    header = (["student"] + [f"Sem{i} SGPA" for i in range(1, max_semesters + 1)]
+              + ["semesters", "CGPA", "percentage"])
+    columns = [result["students"], result["sgpa"], result["semesters"],
+               result["cgpa"], result["percentage"]]
+    if what_if:
+        header += [f"CGPA Sem1-{k}" for k in range(1, max_semesters + 1)]
+        prefix_cgpa = result["prefix_cgpa"]
+        completed = prefix_cgpa.completed[:len(result["students"])]
+        columns.append(np.column_stack([
+            np.where(completed >= k, prefix_cgpa.cgpa_all(k), np.nan)
+            for k in range(1, max_semesters + 1)]))
+
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(header)
+        for student, sgpas, used, cgpa, percentage, *prefixes in zip(*columns):
+            row = ([student] + ["" if np.isnan(s) else f"{s:.2f}" for s in sgpas]
+                   + [int(used), f"{cgpa:.2f}", f"{percentage:.2f}"])
+            for what_if_cgpas in prefixes:
+                row += ["" if np.isnan(c) else f"{c:.2f}" for c in what_if_cgpas]
+            writer.writerow(row)
+
+
+# 📜 Streaming report: one student at a time, straight to the output
+REPORT_FORMATS = ("text", "csv", "json")
+REPORT_BUFFER_BYTES = 1 << 20
+
+
+def _open_text(path, mode):
+    """Opens a file, or stdin/stdout for '-', with a big write buffer."""
+    if path == "-":
+        return open((sys.stdin if mode == "r" else sys.stdout).fileno(), mode,
+                    newline="", closefd=False, buffering=REPORT_BUFFER_BYTES)
+    return open(path, mode, newline="", buffering=REPORT_BUFFER_BYTES)
+
+
+def stream_student_records(lines):
+    """
+    Turns cohort CSV lines (student,semester,subject,grade) into one record
+    per student: (student, [semester 1 grades, semester 2 grades, ...]),
+    where each semester is a list of (grade, gp) like in the interactive mode.
+
+    Only one student is held in memory at a time, so all rows of a student
+    must come together (as they do in a file sorted by student).
+    """
+    student, semesters = None, {}
+    for line_no, row in enumerate(csv.reader(lines), start=1):
+        if not row:
+            continue
+        if len(row) != 4:
+            raise ValueError(f"Line {line_no}: expected student,semester,subject,grade")
+        name, semester, _, grade = (value.strip() for value in row)
+        try:
+            semester = int(semester)
+        except ValueError:
+            if line_no == 1:
+                continue  # Header row
+            raise ValueError(f"Line {line_no}: semester must be a number, got {semester!r}")
+        grade = grade.upper()
+        if grade not in GRADE_TO_GP:
+            raise ValueError(f"Line {line_no}: invalid grade {grade!r}. "
+                             f"Valid grades: {list(GRADE_TO_GP.keys())}")
+
+        if name != student:
+            if student is not None:
+                yield _student_record(student, semesters)
+            student, semesters = name, {}
+        semesters.setdefault(semester, []).append((grade, GRADE_TO_GP[grade]))
+
+    if student is not None:
+        yield _student_record(student, semesters)
+
+
+def _student_record(student, semesters):
+    if sorted(semesters) != list(range(1, len(semesters) + 1)):
+        raise ValueError(f"Semesters must run 1, 2, 3... without gaps for: {student!r}")
+    return student, [semesters[number] for number in range(1, len(semesters) + 1)]
+
+
+def _text_row(student, sgpas, cgpa, percentage):
+    return (f"{student:<15}{len(sgpas):<11}{cgpa:<11.2f}{percentage:<11.2f}"
+            + "".join(f"{sgpa:<11.2f}" for sgpa in sgpas) + "\n")
+
+
+def _csv_row(student, sgpas, cgpa, percentage):
+    # Quote the name only if it needs it, like the csv module would
+    if any(char in student for char in ',"\r\n'):
+        student = '"' + student.replace('"', '""') + '"'
+    return (f"{student},{len(sgpas)},{cgpa:.2f},{percentage:.2f},"
+            + ";".join(f"{sgpa:.2f}" for sgpa in sgpas) + "\n")
+
+
+def _json_row(student, sgpas, cgpa, percentage):
+    return json.dumps({"student": student, "semesters": len(sgpas),
+                       "sgpa": [round(sgpa, 2) for sgpa in sgpas],
+                       "cgpa": round(cgpa, 2), "percentage": round(percentage, 2)})
+
+
+def stream_cohort_report(records, output, fmt="text", n=None):
+    """
+    Writes one report row per student record as soon as it arrives, with a
+    single write() per row, and returns how many rows were written. Memory
+    use doesn't depend on the size of the cohort.
+
+    fmt is 'text' (fixed-width columns), 'csv' (SGPAs joined by ';') or
+    'json' (a JSON array, written one element at a time).
+    """
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}. Choose from {REPORT_FORMATS}.")
+
+    if fmt == "text":
+        output.write(f"{'Student':<15}{'Semesters':<11}{'CGPA':<11}{'Percent':<11}SGPA per semester\n")
+        output.write("-" * 100 + "\n")
+    elif fmt == "csv":
+        output.write("student,semesters,CGPA,percentage,SGPAs\n")
+    else:
+        output.write("[")
+
+    rows = 0
+    for student, semesters in records:
+        used = semesters if n is None else semesters[:n]
+        sgpas = [semester_sgpa(sem_data, len(sem_data)) for sem_data in used]
+        cgpa, percentage = final_cgpa(sgpas)
+        if fmt == "text":
+            output.write(_text_row(student, sgpas, cgpa, percentage))
+        elif fmt == "csv":
+            output.write(_csv_row(student, sgpas, cgpa, percentage))
         else:
-            print("❌ Invalid name.")
+            output.write(("\n  " if rows == 0 else ",\n  ") + _json_row(student, sgpas, cgpa, percentage))
+        rows += 1
+
+    if fmt == "json":
+        output.write("\n]\n" if rows else "]\n")
+    return rows
+
+
+def benchmark_report(students=20000, semesters=8):
+    """Rows/sec of the streaming writer against printing every cell separately."""
+    import os
+    import time
+    from contextlib import redirect_stdout
+
+    sgpas = [6.25 + semester / 10 for semester in range(semesters)]
+    cgpa, percentage = final_cgpa(sgpas)
+
+    with open(os.devnull, "w") as sink, redirect_stdout(sink):
+        start = time.perf_counter()
+        for number in range(students):
+            print(f"{'st' + str(number):<15}", end="")
+            print(f"{semesters:<11}", end="")
+            print(f"{cgpa:<11.2f}", end="")
+            print(f"{percentage:<11.2f}", end="")
+            for sgpa in sgpas:
+                print(f"{sgpa:<11.2f}", end="")
+            print()
+        per_cell = time.perf_counter() - start
+
+    with open(os.devnull, "w", buffering=REPORT_BUFFER_BYTES) as sink:
+        start = time.perf_counter()
+        for number in range(students):
+            sink.write(_text_row("st" + str(number), sgpas, cgpa, percentage))
+        per_row = time.perf_counter() - start
+
+    records = (("st" + str(number), [[("O", 10)] * 5] * semesters) for number in range(students))
+    with open(os.devnull, "w", buffering=REPORT_BUFFER_BYTES) as sink:
+        start = time.perf_counter()
+        stream_cohort_report(records, sink)
+        streamed = time.perf_counter() - start
+
+    print(f"📏 {students} rows of {semesters} semesters")
+    print(f"  print per cell       {students / per_cell:12,.0f} rows/sec")
+    print(f"  one write per row    {students / per_row:12,.0f} rows/sec")
+    print(f"  full stream report   {students / streamed:12,.0f} rows/sec (also computes every SGPA/CGPA)")
+
+
+def batch_main(argv):
+    parser = argparse.ArgumentParser(description="📊 CGPA calculator – batch mode for a whole cohort")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--batch", metavar="COHORT_CSV",
+                      help="grade the whole CSV of student,semester,subject,grade rows at once")
+    mode.add_argument("--report", metavar="COHORT_CSV",
+                      help="stream a report from a CSV grouped by student ('-' for stdin)")
+    mode.add_argument("--benchmark", action="store_true",
+                      help="compare the streaming writer with printing every cell")
+    parser.add_argument("output", nargs="?", default=None,
+                        help="where to write the report (default: cgpa_report.csv, "
+                             "or stdout for --report)")
+    parser.add_argument("--format", choices=REPORT_FORMATS, default="text",
+                        help="--report output format (default: text)")
+    parser.add_argument("--semesters", type=int, default=None,
+                        help="include only semesters 1..N in the CGPA")
+    parser.add_argument("--what-if", action="store_true",
+                        help="--batch also lists the CGPA over semesters 1..k for every k")
+    args = parser.parse_args(argv)
+    if args.semesters is not None and args.semesters < 1:
+        parser.error("--semesters must be at least 1, like the interactive prompt asks")
+
+    if args.benchmark:
+        benchmark_report()
+    elif args.report:
+        with _open_text(args.report, "r") as source, _open_text(args.output or "-", "w") as output:
+            stream_cohort_report(stream_student_records(source), output, args.format, args.semesters)
     else:
-        break
+        output = args.output or "cgpa_report.csv"
+        result = grade_cohort(*read_cohort_csv(args.batch), n=args.semesters)
+        write_cohort_report(result, output, what_if=args.what_if)
+        print(f"✅ Graded {len(result['students'])} students → {output}")
 
-print(f"\n✅ Total Subjects: {len(subjects)} → {', '.join(subjects)}")
 
-# Step 2: Enter grades for each semester
-all_semesters = []  # Each semester: list of (grade, gp)
-sem_count = 1
+# 🚀 Start of Program
+def main():
+    print("=" * 85)
+    print("📊 CGPA CALCULATOR – GRADE INPUT MODE")
+    print("📌 Enter grades directly (e.g., O, A1, B2). No marks needed!")
+    print("=" * 85)
 
-print("\n📥 Now enter grades semester by semester.")
-print("You can enter as many semesters as completed. CGPA will be calculated later.\n")
+    # Step 1: Enter subjects (minimum 4)
+    subjects = []
+    print("\n📋 Enter subject names (minimum 4). Type 'done' to stop after 4.\n")
 
-while True:
-    print(f"\n🎯 ENTER GRADES FOR SEMESTER {sem_count}")
-    sem_data = []
+    while len(subjects) < 4:
+        sub = input(f"Subject {len(subjects) + 1}: ").strip()
+        if sub.lower() == 'done' and len(subjects) >= 4:
+            break
+        if sub == "" or sub.lower() == 'done':
+            print("⚠️  At least 4 subjects required.")
+            continue
+        subjects.append(sub)
 
-    for sub in subjects:
-        while True:
-            grade = input(f"  ➡️  {sub}: ").strip().upper()
-            if grade in GRADE_TO_GP:
-                gp = GRADE_TO_GP[grade]
-                sem_data.append((grade, gp))
-                break
+    # Add more subjects
+    while True:
+        more = input("\n➕ Add another subject? (yes/no): ").strip().lower()
+        if more in ['yes', 'y']:
+            new_sub = input("Subject name: ").strip()
+            if new_sub:
+                subjects.append(new_sub)
             else:
-                print(f"    ❌ Invalid grade. Valid grades: {list(GRADE_TO_GP.keys())}")
-    
-    all_semesters.append(sem_data)
-    sem_count += 1
-
-    # Ask if more semesters
-    more = input("\n📌 Enter next semester? (yes/no): ").strip().lower()
-    if more not in ['yes', 'y']:
-        break
-
-# Step 3: Ask how many semesters to include in CGPA (at the end!)
-print("\n" + "-" * 60)
-print("🎯 FINAL STEP: How many semesters to include in CGPA?")
-for i in range(1, len(all_semesters) + 1):
-    print(f"{i} → Include Semester 1 to {i}")
-print("-" * 60)
-
-while True:
-    try:
-        n = int(input(f"Enter number (1 to {len(all_semesters)}): "))
-        if 1 <= n <= len(all_semesters):
-            break
+                print("❌ Invalid name.")
         else:
-            print(f"❌ Please enter between 1 and {len(all_semesters)}.")
-    except ValueError:
-        print("❌ Enter a valid number.")
-
-# Step 4: Calculate SGPA for each of the first `n` semesters
-sgpas = []
-for i in range(n):
-    total_gp = sum(data[1] for data in all_semesters[i])
-    sgpa = total_gp / len(subjects)
-    sgpas.append(sgpa)
-
-# Final CGPA
-cgpa = sum(sgpas) / len(sgpas)
-percentage = cgpa * 9.5  # CBSE-style approximation
-
-# Step 5: Display Full Report
-print("\n" + "=" * 100)
-print("🎓 FINAL ACADEMIC REPORT".center(100))
-print("=" * 100)
-
-# Header
-print(f"{'Subject':<15}", end="")
-for i in range(1, n + 1):
-    print(f"Sem{i} Grade  ", end="")
-print()
-
-print("-" * 100)
-
-# Subject rows
-for idx, sub in enumerate(subjects):
-    print(f"{sub:<15}", end="")
-    for sem_idx in range(n):
-        grade, gp = all_semesters[sem_idx][idx]
-        print(f"{grade:<11}", end="")
-    print()
-
-print("-" * 100)
-
-# SGPA Row
-print(f"{'SGPA':<15}", end="")
-for i in range(n):
-    print(f"{sgpas[i]:<11.2f}", end="")
-print()
-
-print("-" * 100)
-print(f"🎯 CGPA (based on {n} semester(s)): {cgpa:.2f}")
-print(f"📌 Approximate Percentage (CBSE-style): {percentage:.2f}%")
-print("=" * 100)
-
-# Optional: Show grade key
-show_key = input("\nShow grade key? (yes/no): ").strip().lower()
-if show_key in ['yes', 'y']:
-    print("\n📘 Grade Key:")
-    for g, desc in GRADE_MEANING.items():
-        print(f"{g} → {desc}")
+            break
+
+    print(f"\n✅ Total Subjects: {len(subjects)} → {', '.join(subjects)}")
+
+    # Step 2: Enter grades for each semester
+    all_semesters = []  # Each semester: list of (grade, gp)
+    sem_count = 1
+
+    print("\n📥 Now enter grades semester by semester.")
+    print("You can enter as many semesters as completed. CGPA will be calculated later.\n")
+
+    while True:
+        print(f"\n🎯 ENTER GRADES FOR SEMESTER {sem_count}")
+        sem_data = []
+
+        for sub in subjects:
+            while True:
+                grade = input(f"  ➡️  {sub}: ").strip().upper()
+                if grade in GRADE_TO_GP:
+                    gp = GRADE_TO_GP[grade]
+                    sem_data.append((grade, gp))
+                    break
+                else:
+                    print(f"    ❌ Invalid grade. Valid grades: {list(GRADE_TO_GP.keys())}")
+
+        all_semesters.append(sem_data)
+        sem_count += 1
+
+        # Ask if more semesters
+        more = input("\n📌 Enter next semester? (yes/no): ").strip().lower()
+        if more not in ['yes', 'y']:
+            break
+
+    # Step 3: Ask how many semesters to include in CGPA (at the end!)
+    print("\n" + "-" * 60)
+    print("🎯 FINAL STEP: How many semesters to include in CGPA?")
+    for i in range(1, len(all_semesters) + 1):
+        print(f"{i} → Include Semester 1 to {i}")
+    print("-" * 60)
+
+    while True:
+        try:
+            n = int(input(f"Enter number (1 to {len(all_semesters)}): "))
+            if 1 <= n <= len(all_semesters):
+                break
+            else:
+                print(f"❌ Please enter between 1 and {len(all_semesters)}.")
+        except ValueError:
+            print("❌ Enter a valid number.")
+
+    # Step 4: Calculate SGPA for each of the first `n` semesters
+    sgpas = [semester_sgpa(all_semesters[i], len(subjects)) for i in range(n)]
+
+    # Final CGPA
+    cgpa, percentage = final_cgpa(sgpas)
+
+    # Step 5: Display Full Report
+    print("\n" + "=" * 100)
+    print("🎓 FINAL ACADEMIC REPORT".center(100))
+    print("=" * 100)
+
+    # Each row is built in full and printed in one go
+    # Header
+    print(f"{'Subject':<15}" + "".join(f"Sem{i} Grade  " for i in range(1, n + 1)))
+
+    print("-" * 100)
+
+    # Subject rows
+    for idx, sub in enumerate(subjects):
+        print(f"{sub:<15}" + "".join(f"{all_semesters[sem_idx][idx][0]:<11}" for sem_idx in range(n)))
+
+    print("-" * 100)
+
+    # SGPA Row
+    print(f"{'SGPA':<15}" + "".join(f"{sgpas[i]:<11.2f}" for i in range(n)))
+
+    print("-" * 100)
+    print(f"🎯 CGPA (based on {n} semester(s)): {cgpa:.2f}")
+    print(f"📌 Approximate Percentage (CBSE-style): {percentage:.2f}%")
+    print("=" * 100)
+
+    # Optional: Show grade key
+    show_key = input("\nShow grade key? (yes/no): ").strip().lower()
+    if show_key in ['yes', 'y']:
+        print("\n📘 Grade Key:")
+        for g, desc in GRADE_MEANING.items():
+            print(f"{g} → {desc}")
+
+
+if __name__ == "__main__":
+    if {"--batch", "--report", "--benchmark"} & set(sys.argv):
+        batch_main(sys.argv[1:])
+    else:
+        main()
@@ -0,0 +1,232 @@
+"""
+Output Sinks
+
+Purpose:
+Lets the bank and shop programs report what happened ("₹500 deposited",
+"Added 2 x 'Scarf' to your cart!") without printing on the spot.
+
+Every operation creates an Event: what happened, whether it worked, the
+numbers involved, and the sentence to show a person. The event is handed to
+the current sink, which decides what to do with it:
+
+  ConsoleSink   prints the sentence right away (the default, as before)
+  SilentSink    throws events away; nothing is ever even formatted
+  BufferedSink  collects sentences and writes them out in big batches
+  ThreadedSink  hands events to a background thread that writes them
+
+For bulk work (replaying thousands of transactions, say) printing each line
+costs more than the work itself, so switch to a quieter sink:
+
+    with use_sink(SilentSink()):
+        for amount in amounts:
+            account.deposit(amount)
+"""
+
+import atexit      # To write out anything still waiting when Python exits
+import os          # For the benchmark's output file
+import sys         # To find the console and spot the --benchmark option
+import threading   # For the background writer
+import time        # For the benchmark
+from collections import deque, namedtuple
+from contextlib import contextmanager
+
+
+class Event(namedtuple("Event", "kind ok data template")):
+    """
+    What one operation did. `data` holds its numbers (amount, balance, ...)
+    and `template` the sentence for people, filled in only when a sink
+    actually needs text. An event is truthy when the operation worked.
+    """
+    __slots__ = ()
+
+    def __bool__(self):
+        return self.ok
+
+    def text(self):
+        return self.template.format(**self.data)
+
+
+class ConsoleSink:
+    """Prints every event as soon as it happens, just like print() did."""
+    def __init__(self, stream=None):
+        self.stream = stream  # None means whatever sys.stdout is at the time
+
+    def emit(self, event):
+        print(event.text(), file=self.stream if self.stream is not None else sys.stdout)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class SilentSink:
+    """Ignores every event. Only counts them."""
+    def __init__(self):
+        self.count = 0
+
+    def emit(self, event):
+        self.count += 1
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class BufferedSink:
+    """
+    Collects sentences and writes `batch_size` of them at a time with a
+    single write() call. Call flush() (or close()) to write the rest.
+    """
+    def __init__(self, stream=None, batch_size=1000):
+        self.stream = stream
+        self.batch_size = batch_size
+        self._lines = []
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def emit(self, event):
+        with self._lock:
+            self._lines.append(event.text())
+            if len(self._lines) >= self.batch_size:
+                self._write()
+
+    def _write(self):
+        lines, self._lines = self._lines, []
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write("\n".join(lines) + "\n")
+        stream.flush()
+
+    def flush(self):
+        with self._lock:
+            if self._lines:
+                self._write()
+
+    def close(self):
+        self.flush()
+        atexit.unregister(self.flush)
+
+
+class ThreadedSink:
+    """
+    Puts events in a queue and returns at once; every `interval` seconds a
+    background thread formats and writes whatever has piled up, in one go.
+    If more than `max_queue` events pile up, the emitting thread writes them
+    itself, so memory stays bounded.
+    """
+    def __init__(self, stream=None, interval=0.05, max_queue=100000):
+        self.stream = stream
+        self.interval = interval
+        self.max_queue = max_queue
+        self._events = deque()          # Appending and popping are thread-safe
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._writer = threading.Thread(target=self._drain, name="output-sink", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def emit(self, event):
+        self._events.append(event)
+        if len(self._events) > self.max_queue:
+            self.flush()
+
+    def _drain(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+        self.flush()
+
+    def flush(self):
+        """Writes every event waiting so far."""
+        with self._write_lock:
+            waiting = len(self._events)
+            if not waiting:
+                return
+            popleft = self._events.popleft
+            events = [popleft() for _ in range(waiting)]
+            stream = self.stream if self.stream is not None else sys.stdout
+            stream.write("\n".join(event.text() for event in events) + "\n")
+            stream.flush()
+
+    def close(self):
+        self._stop.set()
+        self._writer.join()
+        atexit.unregister(self.close)
+
+
+_current_sink = ConsoleSink()
+
+
+def get_sink():
+    return _current_sink
+
+
+def set_sink(sink):
+    """Sends all events to `sink` from now on. Returns the previous sink."""
+    global _current_sink
+    previous, _current_sink = _current_sink, sink
+    return previous
+
+
+@contextmanager
+def use_sink(sink):
+    """Uses `sink` inside a with block, then flushes it and goes back to the old one."""
+    previous = set_sink(sink)
+    try:
+        yield sink
+    finally:
+        sink.flush()
+        set_sink(previous)
+
+
+def emit(kind, ok, template, **data):
+    """Creates an event, hands it to the current sink and returns it."""
+    event = Event(kind, ok, data, template)
+    _current_sink.emit(event)
+    return event
+
+
+def benchmark_sinks(operations=200000):
+    """Bulk deposits, withdrawals and add-to-carts with each kind of sink."""
+    import tempfile
+
+    from account_store import AccountStore
+    from bank_system_withSecurity import BankAccount
+    from OnlineclothesShopping import Product, ShoppingCart, StockReservations
+    from simple_bank_system import bank
+
+    print(f"📏 {operations:,} operations per run, written to a line-buffered file (like a terminal)")
+    with tempfile.TemporaryDirectory() as folder, \
+            open(os.path.join(folder, "output.txt"), "w", buffering=1) as console:
+        sinks = (("console", lambda: ConsoleSink(console)),
+                 ("silent", SilentSink),
+                 ("buffered", lambda: BufferedSink(console)),
+                 ("threaded", lambda: ThreadedSink(console)))
+        for label, make_sink in sinks:
+            store = AccountStore()
+            simple = bank("Bench", "Savings", 0, store=store)
+            secure = BankAccount("BENCH", "Bench", 0, store=store)
+            cart = ShoppingCart(StockReservations())
+            shelf = [Product(item_id, f"Item {item_id}", "Tops", 9.99, 10 ** 9) for item_id in range(64)]
+
+            sink = make_sink()
+            start = time.perf_counter()
+            with use_sink(sink):
+                for step in range(operations // 4):
+                    simple.deposit(10)
+                    simple.withdraw(5)
+                    secure.deposit(10)
+                    cart.add_item(shelf[step % len(shelf)], 1)
+            elapsed = time.perf_counter() - start
+            sink.close()
+            print(f"  {label:<9} {operations / elapsed:12,.0f} operations/sec")
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        # Run it from the imported module, whose current sink is the one the
+        # bank and shop programs report to (not this __main__ copy's)
+        from output_sinks import benchmark_sinks
+        benchmark_sinks()
@@ -0,0 +1,259 @@
+# ----------------------------------------------------------------------
+# The Clothes Shop as a Network Service
+# Serves the OnlineclothesShopping catalog to many shoppers at once from a
+# single asyncio event loop. Every connection is its own shopping session
+# with its own cart.
+#
+# The protocol is line based: send one command per line, get one JSON
+# object back per line.
+#   BROWSE [offset] [limit]     in-stock products, by ID
+#   CATEGORY <name>             in-stock products in a category
+#   PRICE <low> <high>          in-stock products in a price range
+#   ADD <id> <quantity>         put a product in your cart
+#   REMOVE <id>                 take a product out of your cart
+#   CART                        what's in your cart, and the total
+#   CHECKOUT                    buy everything in your cart
+#   QUIT                        say goodbye
+#
+#   python shopping_server.py [--port 8888] [catalog.sqlite | catalog.jsonl]
+#   python shopping_server.py --load-test
+# ----------------------------------------------------------------------
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from OnlineclothesShopping import (Catalog, LazyCatalog, Product, ShoppingApp,
+                                   ShoppingCart, StockReservations, open_catalog_source)
+
+# --- 1. Settings ---
+
+DEFAULT_PORT = 8888
+IDLE_TIMEOUT = 300          # Seconds a session may sit idle before we hang up
+RESERVATION_TIMEOUT = 900   # Seconds stock stays in a cart without checkout
+MAX_SESSIONS = 10000        # Shoppers served at once; more wait at the door
+MAX_LINE_BYTES = 4096       # Longest command we accept
+PAGE_LIMIT = 100            # Most products one BROWSE answer may hold
+
+
+def _product_json(product):
+    return {"id": product.id, "name": product.name, "category": product.category,
+            "price": product.price, "stock": product.stock}
+
+
+# --- 2. The Service ---
+
+class ShopService:
+    """
+    Runs the shop for many shoppers at once.
+
+    Each connection gets its own ShoppingCart, all sharing one
+    StockReservations engine, so stock is never oversold and the stock in an
+    abandoned cart goes back on the shelf after RESERVATION_TIMEOUT.
+
+    Backpressure: a shopper's next command is only read once the previous
+    answer has been flushed to them, commands are limited to MAX_LINE_BYTES,
+    and at most MAX_SESSIONS shoppers are served at once.
+    """
+    def __init__(self, catalog=None, idle_timeout=IDLE_TIMEOUT,
+                 reservation_timeout=RESERVATION_TIMEOUT, max_sessions=MAX_SESSIONS):
+        self.catalog = catalog if catalog is not None else ShoppingApp().products
+        self.idle_timeout = idle_timeout
+        self.reservations = StockReservations(timeout=reservation_timeout)
+        self._doors = asyncio.Semaphore(max_sessions)
+        self._reaper = None
+        self.sessions = 0
+
+    async def handle(self, reader, writer):
+        """Serves one shopper from connect to goodbye."""
+        async with self._doors:
+            self.sessions += 1
+            cart = ShoppingCart(self.reservations)
+            try:
+                while True:
+                    try:
+                        line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                    except asyncio.TimeoutError:
+                        await self._send(writer, {"ok": False, "error": "idle timeout, goodbye"})
+                        break
+                    except ValueError:  # Line longer than MAX_LINE_BYTES
+                        await self._send(writer, {"ok": False, "error": "command too long"})
+                        break
+                    if not line:
+                        break  # The shopper hung up
+
+                    command = line.decode("utf-8", "replace").split()
+                    if command and command[0].upper() == "QUIT":
+                        await self._send(writer, {"ok": True, "message": "goodbye"})
+                        break
+                    answer, cart = self.handle_command(cart, command)
+                    await self._send(writer, answer)
+            except ConnectionError:
+                pass
+            finally:
+                # Whatever wasn't checked out goes back on the shelf
+                for product in list(cart.items):
+                    cart.remove_item(product)
+                self.sessions -= 1
+                writer.close()
+
+    async def _send(self, writer, answer):
+        writer.write(json.dumps(answer).encode("utf-8") + b"\n")
+        await writer.drain()  # Wait here if the shopper isn't keeping up
+
+    def handle_command(self, cart, command):
+        """Answers one command. Returns the answer and the cart to use next."""
+        if not command:
+            return {"ok": False, "error": "empty command"}, cart
+        name, arguments = command[0].upper(), command[1:]
+        try:
+            if name == "BROWSE":
+                offset = int(arguments[0]) if arguments else 0
+                limit = min(int(arguments[1]), PAGE_LIMIT) if len(arguments) > 1 else ShoppingApp.PAGE_SIZE
+                products = self.catalog.in_stock(offset=offset, limit=limit)
+                return {"ok": True, "products": [_product_json(p) for p in products]}, cart
+            if name == "CATEGORY":
+                products = self.catalog.by_category(" ".join(arguments), limit=PAGE_LIMIT)
+                return {"ok": True, "products": [_product_json(p) for p in products]}, cart
+            if name == "PRICE":
+                low, high = float(arguments[0]), float(arguments[1])
+                products = self.catalog.price_between(low, high, limit=PAGE_LIMIT)
+                return {"ok": True, "products": [_product_json(p) for p in products]}, cart
+            if name == "ADD":
+                product = self.catalog[int(arguments[0])]
+                quantity = int(arguments[1])
+                if quantity <= 0:
+                    return {"ok": False, "error": "quantity must be 1 or more"}, cart
+                if not self.reservations.reserve(cart, product, quantity):
+                    return {"ok": False, "error": f"only {product.stock} of '{product.name}' available"}, cart
+                return {"ok": True, "added": quantity, "id": product.id}, cart
+            if name == "REMOVE":
+                cart.remove_item(self.catalog[int(arguments[0])])
+                return {"ok": True}, cart
+            if name == "CART":
+                return {"ok": True, **self._cart_json(cart)}, cart
+            if name == "CHECKOUT":
+                order = self._cart_json(cart)
+                cart.checkout()
+                # A fresh cart for whatever the shopper buys next
+                return {"ok": True, "order": order}, ShoppingCart(self.reservations)
+            return {"ok": False, "error": f"unknown command {name}"}, cart
+        except (IndexError, ValueError):
+            return {"ok": False, "error": f"bad arguments for {name}"}, cart
+        except KeyError:
+            return {"ok": False, "error": "no such product"}, cart
+
+    @staticmethod
+    def _cart_json(cart):
+        lines = [{"id": product.id, "name": product.name, "quantity": quantity,
+                  "subtotal": unit_cents * quantity / 100}
+                 for product, quantity, unit_cents in cart.lines()]
+        return {"items": lines, "total": cart.total_cents / 100}
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT):
+        """Starts listening and returns the asyncio server."""
+        if self._reaper is None:
+            self._reaper = asyncio.create_task(self._reap())
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_LINE_BYTES)
+
+    async def _reap(self, interval=1.0):
+        # Abandoned stock goes back on the shelf from the event loop itself
+        # (not a thread), so it never changes the catalog while a command
+        # is being answered
+        while True:
+            await asyncio.sleep(interval)
+            self.reservations.expire()
+
+    def stop_reaper(self):
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+
+
+# --- 3. Load Generator ---
+
+async def _shopper(host, port, product_ids, rounds, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    chooser = random.Random()
+
+    async def ask(kind, line):
+        start = time.perf_counter()
+        writer.write(line.encode("utf-8") + b"\n")
+        await writer.drain()
+        answer = await reader.readline()
+        latencies[kind].append(time.perf_counter() - start)
+        return json.loads(answer)
+
+    try:
+        for _ in range(rounds):
+            await ask("browse", f"BROWSE {chooser.randrange(0, 200)} 20")
+            await ask("add", f"ADD {chooser.choice(product_ids)} 1")
+            await ask("checkout", "CHECKOUT")
+        await ask("quit", "QUIT")
+    finally:
+        writer.close()
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def load_test(sessions=2000, rounds=5, products=5000):
+    """
+    Starts a service on a free local port, then lets `sessions` shoppers
+    browse, add and check out at the same time. Reports p50/p99 latency.
+    """
+    catalog = Catalog(Product(item_id, f"Item {item_id}", "Tops", 9.99, 10 ** 6)
+                      for item_id in range(1, products + 1))
+    service = ShopService(catalog)
+    server = await service.serve(port=0)
+    host, port = server.sockets[0].getsockname()[:2]
+
+    latencies = {"browse": [], "add": [], "checkout": [], "quit": []}
+    product_ids = list(range(1, products + 1))
+    start = time.perf_counter()
+    async with server:
+        await asyncio.gather(*(_shopper(host, port, product_ids, rounds, latencies)
+                               for _ in range(sessions)))
+        elapsed = time.perf_counter() - start
+        service.stop_reaper()
+
+    requests = sum(len(values) for values in latencies.values())
+    print(f"📏 {sessions} concurrent sessions x {rounds} rounds: "
+          f"{requests / elapsed:,.0f} requests/sec in one event loop")
+    for kind in ("browse", "add", "checkout"):
+        values = latencies[kind]
+        print(f"  {kind:<9} p50 {_percentile(values, 0.50) * 1000:7.2f} ms   "
+              f"p99 {_percentile(values, 0.99) * 1000:7.2f} ms")
+
+
+# --- 4. Execution Block ---
+
+async def main(argv=None):
+    parser = argparse.ArgumentParser(description="👗 The Console Clothing Boutique, as a network service")
+    parser.add_argument("catalog", nargs="?", help="a .sqlite or .jsonl catalog (default: built-in inventory)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--load-test", action="store_true", help="run the local load generator")
+    args = parser.parse_args(argv)
+
+    if args.load_test:
+        await load_test()
+        return
+
+    catalog = LazyCatalog(open_catalog_source(args.catalog)) if args.catalog else None
+    service = ShopService(catalog)
+    server = await service.serve(args.host, args.port)
+    print(f"🛍️  Serving the boutique on {args.host}:{args.port} (Ctrl+C to stop)")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\nShop closed. Goodbye!")
@@ -1,34 +1,77 @@
+from account_store import DEFAULT_STORE
+from output_sinks import emit
+
 # Define a class called 'bank' that models a simple bank account
 class bank:
+    # The name, type and balance live in an AccountStore shared with
+    # bank_system_withSecurity; this object only remembers where
+    __slots__ = ("store", "slot", "amount")
+
     # Constructor method to initialize a bank account
-    def __init__(self, name, accType, amount):
-        self.name = name           # Account holder's name
-        self.accType = accType     # Type of account (e.g., Savings, Current)
+    def __init__(self, name, accType, amount, store=None):
+        self.store = store if store is not None else DEFAULT_STORE
+        # Open a new account with a balance of 0 (no account number: it's
+        # reached only through its slot, apart from numbered accounts)
+        self.slot = self.store.open(None, name, accType, 0)
         self.amount = amount       # Initial amount passed (not used directly in logic)
-        self.balance = 0           # Initialize account balance to 0
+
+    def __del__(self):
+        # Give the account's slot back to the store once this object is gone
+        slot = getattr(self, "slot", None)
+        if slot is not None:
+            self.store.close(slot)
+
+    @property
+    def name(self):                # Account holder's name
+        return self.store.holders[self.slot]
+
+    @property
+    def accType(self):             # Type of account (e.g., Savings, Current)
+        return self.store.kind(self.slot)
+
+    @property
+    def balance(self):             # Current balance
+        return self.store.balance(self.slot)
+
+    @balance.setter
+    def balance(self, value):
+        self.store.set_balance(self.slot, value)
 
     # Method to display account holder's information and current balance
     def display_info(self):
-        print(f"Name of Account Holder: {self.name} Account Type: {self.accType} balance: {self.balance}")
+        return emit("info", True, "Name of Account Holder: {name} Account Type: {accType} balance: {balance}",
+                    name=self.name, accType=self.accType, balance=self.balance)
+
+    # Every method below reports what happened through the current output
+    # sink (see output_sinks.py) and returns it as an Event, which is
+    # truthy when the operation worked
 
     # Method to deposit money into the account
     def deposit(self, amount):
         if amount > 0:
             self.balance += amount  # Add deposit amount to current balance
-            print(f"{amount}$ is Deposited. Your New Account Balace is {self.balance}")
+            return emit("deposit", True, "{amount}$ is Deposited. Your New Account Balace is {balance}",
+                        amount=amount, balance=self.balance)
         else:
-            print("Invalid Deposit Amount...")  # Print error if amount is not positive
+            # Error if amount is not positive
+            return emit("deposit", False, "Invalid Deposit Amount...", amount=amount)
 
     # Method to withdraw money from the account
     def withdraw(self, amount):
         if amount > self.balance:
-            print("Insufficient Balance")  # Error if trying to withdraw more than available
+            # Error if trying to withdraw more than available
+            return emit("withdraw", False, "Insufficient Balance", amount=amount, balance=self.balance)
         elif amount <= 0:
-            print("Invalid Withdrawal amount")  # Error if amount is zero or negative
+            # Error if amount is zero or negative
+            return emit("withdraw", False, "Invalid Withdrawal amount", amount=amount)
         else:
             self.balance -= amount  # Subtract amount from balance
-            print(f"{amount} has been withdrawn....    Your Remaining Account Balance is {self.balance} ")
+            return emit("withdraw", True,
+                        "{amount} has been withdrawn....    Your Remaining Account Balance is {balance} ",
+                        amount=amount, balance=self.balance)
 
     # Method to check the current balance
     def check_balance(self):
-        print(f" Dear {self.name} your current bank balance is: {self.balance}. Account Type:{self.accType}")
+        return emit("balance", True,
+                    " Dear {name} your current bank balance is: {balance}. Account Type:{accType}",
+                    name=self.name, balance=self.balance, accType=self.accType)